@@ -1,34 +1,137 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from orchestrator.orchestrator import run_pipeline
+from typing import List
+from orchestrator.orchestrator import run_pipeline, run_batch, stream_pipeline
+from orchestrator.metrics import METRICS, MetricsMiddleware, stage_timer
+from orchestrator.profiling import PROFILE_HEADER, profile_request, run_profiled
+from orchestrator.serialization import Projection
+from app.responses import FastJSONResponse, json_response
+from app.storage import S3ClientHolder, iter_object_text, iter_upload_file, load_analysis, store_analysis, upload_stream
+from app.warmup import WARMUP_ENABLED, mark_ready, readiness, warm_up
+from engines.Rowan_Analysis_Context import AnalysisContext
+from engines.Rowan_Chunked_Analysis import analyze_stream
+from engines.Rowan_Config_Registry import current_snapshot, registry
+from engines.Rowan_Statute_Library import preload_statute_library, statute_library
 import os
-import boto3
 
-app = FastAPI(title="Rowan Orchestration API", version="2.0")
+app = FastAPI(title="Rowan Orchestration API", version="2.0", default_response_class=FastJSONResponse)
+app.add_middleware(MetricsMiddleware)
+
+MAX_BATCH_ITEMS = int(os.getenv("ROWAN_MAX_BATCH_ITEMS", "5000"))
 
 # ===== Orchestrator API =====
 class OrchestrationRequest(BaseModel):
     user_input: str
     mode: str = None
     session_id: str = "default"
+    statute_id: str = None   # statute library section to read the input against, e.g. "NRS 432B.220"
+
+def require_statute(statute_id: str):
+    """Reject an unknown statute id before any pipeline work: 404, or 422 when no library is built."""
+    if not statute_id:
+        return
+    try:
+        known = statute_id in statute_library()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not known:
+        raise HTTPException(status_code=404, detail=f"Unknown statute section: {statute_id}")
+
+@app.on_event("startup")
+def load_rule_configs():
+    """
+    Load and validate rule/canon configs before serving, then hot-reload them on change.
+    Metrics are shared with the other workers when ROWAN_METRICS_DIR is set.
+    The worker then warms up before it accepts connections (see app.warmup).
+    """
+    registry.current()
+    registry.watch()
+    METRICS.share()
+    preload_statute_library()
+    if WARMUP_ENABLED:
+        warm_up()
+    else:
+        mark_ready()
 
 @app.get("/")
 def root():
     return {"status": "ok", "message": "Rowan Orchestration API with Docs Upload is live"}
 
+@app.get("/ready")
+def ready():
+    """Readiness, unlike the liveness check at /: 503 until this worker has warmed up, or if warm-up failed."""
+    status = readiness()
+    return FastJSONResponse(dict(status, config_version=current_snapshot().version),
+                            status_code=200 if status["ready"] else 503)
+
+@app.get("/metrics")
+def metrics():
+    """Stage and request latency histograms, counters and in-flight gauges in Prometheus text format."""
+    return Response(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.post("/orchestrate")
-def orchestrate(request: OrchestrationRequest):
+def orchestrate(request: OrchestrationRequest, fields: str = None, timings: bool = False,
+                x_rowan_profile: str = Header(None), x_request_id: str = Header(None)):
+    """
+    Run one input through the pipeline. `fields` projects the result: dotted
+    paths keep only those parts ("status,handoff.final_score"), "-" paths drop
+    parts, and a bare "-name" drops that key everywhere, e.g.
+    "-persona_options,-alternatives,-metadata".
+    `timings=true` adds a "timings" block with this request's per-stage wall times (ms).
+    A sampled request, or one sent with an X-Rowan-Profile header when that is
+    allowed (see orchestrator.profiling), is profiled; the response then names
+    the profile in its own X-Rowan-Profile header.
+    """
+    require_statute(request.statute_id)
     try:
-        return run_pipeline(request.user_input, request.mode, request.session_id)
+        analysis_context = AnalysisContext()
+        profile = profile_request(x_rowan_profile, x_request_id)
+        result, report = run_profiled(profile, run_pipeline, request.user_input, request.mode, request.session_id,
+                                      analysis_context, statute_id=request.statute_id, use_cache=profile is None)
+        if timings:
+            result["timings"] = analysis_context.timings
+        return json_response(result, fields, {PROFILE_HEADER: report["request_id"]} if report else None)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/orchestrate/stream")
+def orchestrate_stream(request: OrchestrationRequest, fields: str = None):
+    """
+    Same pipeline as /orchestrate, streamed as newline-delimited JSON: one event per
+    stage (ambiguity_gate, logic_evaluation, canon_interpretation, weighting, persona)
+    as it completes, then the full result, projected by `fields` as in /orchestrate.
+    """
+    require_statute(request.statute_id)
+    return StreamingResponse(
+        stream_pipeline(request.user_input, request.mode, request.session_id, fields, request.statute_id),
+        media_type="application/x-ndjson"
+    )
+
+@app.post("/orchestrate/batch")
+def orchestrate_batch(requests: List[OrchestrationRequest], fields: str = None, timings: bool = False):
+    """
+    Run many inputs in one round trip. Results come back in request order;
+    an item that fails carries its own error instead of failing the batch.
+    `fields` projects each item's result and `timings=true` adds each item's
+    per-stage wall times, as in /orchestrate.
+    """
+    if len(requests) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_ITEMS} items")
+    results = run_batch([(r.user_input, r.mode, r.session_id, r.statute_id) for r in requests], timings)
+    if fields:
+        projection = Projection(fields)
+        for item in results:
+            if item["ok"]:
+                item["result"] = projection.apply(item["result"])
+    return json_response({"results": results})
+
 # ===== AWS S3 Setup =====
 AWS_REGION = os.getenv("AWS_REGION")
 AWS_S3_BUCKET = os.getenv("AWS_S3_BUCKET")
 
-s3 = boto3.client(
-    "s3",
+# Created on the first /docs request, not at import: see S3ClientHolder.
+s3_clients = S3ClientHolder(
     aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
     aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
     region_name=AWS_REGION
@@ -39,11 +142,56 @@ s3 = boto3.client(
 async def upload_doc(side: str, file: UploadFile = File(...)):
     """
     Upload a document to S3 under a folder named by 'side' (e.g., 'plaintiff' or 'defense').
+    The body is streamed to S3 as a concurrent multipart upload off the event loop.
     """
     try:
         key = f"{side}/{file.filename}"
-        s3.upload_fileobj(file.file, AWS_S3_BUCKET, key)
-        return {"message": "File uploaded successfully", "s3_key": key}
+        with stage_timer("docs.upload"):
+            stats = await upload_stream(s3_clients.get(), AWS_S3_BUCKET, key, iter_upload_file(file))
+        return {"message": "File uploaded successfully", "s3_key": key, "upload": stats}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/docs/analyze")
+def analyze_doc(key: str, fields: str = None, timings: bool = False, claims: bool = False):
+    """
+    Run the logic and canon engines over a document already stored in S3.
+
+    The object is streamed, decoded and segmented incrementally, so large
+    exhibits never sit in memory whole. The result is stored next to the
+    object and returned as-is on repeat requests until the object or the
+    rule config changes. `fields` and `timings` work as in /orchestrate.
+    The logic result holds scores and counts; `claims=true` adds per-claim
+    detail, stored separately. It is many times the document's size, so
+    expect a large response for a large exhibit.
+    """
+    s3 = s3_clients.get()  # outside the try: the handlers below need s3.exceptions
+    try:
+        snapshot = current_snapshot()
+        stage_ms = {}
+        with stage_timer("docs.head_object", stage_ms):
+            etag = s3.head_object(Bucket=AWS_S3_BUCKET, Key=key)["ETag"]
+        with stage_timer("docs.load_analysis", stage_ms):
+            stored = load_analysis(s3, AWS_S3_BUCKET, key, snapshot.version, etag, claims)
+        if stored is not None:
+            response = {"s3_key": key, "stored": True, "analysis": stored}
+        else:
+            # The object is read as it is analysed, so S3 transfer time is part of this stage.
+            with stage_timer("docs.analyze_stream", stage_ms):
+                body = s3.get_object(Bucket=AWS_S3_BUCKET, Key=key, IfMatch=etag)["Body"]
+                analysis = dict(analyze_stream(iter_object_text(body), snapshot, claims=claims), s3_key=key, etag=etag)
+            with stage_timer("docs.store_analysis", stage_ms):
+                store_analysis(s3, AWS_S3_BUCKET, key, analysis, claims)
+            response = {"s3_key": key, "stored": False, "analysis": analysis}
+        if timings:
+            response["timings"] = stage_ms
+        return json_response(response, fields)
+    except s3.exceptions.ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+            raise HTTPException(status_code=404, detail=f"No such document: {key}")
+        raise HTTPException(status_code=500, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -53,7 +201,7 @@ async def get_signed_url(key: str):
     Generate a temporary download URL for a file stored in S3.
     """
     try:
-        url = s3.generate_presigned_url(
+        url = s3_clients.get().generate_presigned_url(
             'get_object',
             Params={'Bucket': AWS_S3_BUCKET, 'Key': key},
             ExpiresIn=3600  # 1 hour
@@ -0,0 +1,20 @@
+from fastapi.responses import JSONResponse
+
+from orchestrator.serialization import dumps, project
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded by orchestrator.serialization.dumps (orjson when installed)."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def json_response(content, fields: str = None, headers: dict = None) -> FastJSONResponse:
+    """
+    Project and encode a result directly.
+
+    Returning a Response instance skips FastAPI's jsonable_encoder pass, which
+    walks the whole result in Python before encoding it again.
+    """
+    return FastJSONResponse(project(content, fields), headers=headers)
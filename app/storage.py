@@ -0,0 +1,179 @@
+import asyncio
+import codecs
+import os
+import threading
+import time
+from typing import AsyncIterator, Iterator, Optional
+
+from orchestrator.serialization import dumps, loads
+
+# ===== S3 Client =====
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("ROWAN_S3_MAX_POOL_CONNECTIONS", "32"))
+
+
+class S3ClientHolder:
+    """
+    One boto3 S3 client per process, created on first use.
+
+    boto3 and botocore are imported only then, so workers that never touch
+    S3 neither pay for the import nor depend on AWS settings to boot. The
+    client is thread-safe and keeps a connection pool of
+    ROWAN_S3_MAX_POOL_CONNECTIONS, large enough for concurrent requests and
+    their in-flight upload parts to reuse connections instead of opening new ones.
+    """
+
+    def __init__(self, **client_kwargs):
+        self.client_kwargs = client_kwargs
+        self._client = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import boto3
+                    from botocore.config import Config
+
+                    self._client = boto3.client(
+                        "s3", config=Config(max_pool_connections=S3_MAX_POOL_CONNECTIONS), **self.client_kwargs
+                    )
+        return self._client
+
+# ===== Upload Tuning =====
+# S3 requires every part except the last to be at least 5 MiB.
+PART_SIZE = max(int(os.getenv("ROWAN_UPLOAD_PART_BYTES", str(8 * 1024 * 1024))), 5 * 1024 * 1024)
+MAX_INFLIGHT_PARTS = int(os.getenv("ROWAN_UPLOAD_MAX_INFLIGHT_PARTS", "4"))
+READ_CHUNK = 1024 * 1024
+
+
+async def iter_upload_file(file, chunk_size: int = READ_CHUNK) -> AsyncIterator[bytes]:
+    """Yield an UploadFile's body in chunks without reading it whole."""
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def upload_stream(s3, bucket: str, key: str, chunks: AsyncIterator[bytes],
+                        part_size: int = PART_SIZE, max_inflight: int = MAX_INFLIGHT_PARTS) -> dict:
+    """
+    Upload a stream of byte chunks to S3 without blocking the event loop.
+
+    Every boto3 call runs in a worker thread. The stream is cut into parts of
+    `part_size` bytes that are uploaded concurrently, at most `max_inflight`
+    at a time. Reading waits for a free slot, so memory stays around
+    (max_inflight + 1) * part_size whatever the file size. A body smaller
+    than one part goes up with a single put_object. A failed upload is
+    aborted so no orphaned parts are left behind.
+    """
+    started = time.perf_counter()
+    slots = asyncio.Semaphore(max_inflight)
+    buffer = bytearray()
+    upload_id = None
+    tasks = []
+    total = 0
+
+    async def send_part(part_number, data):
+        try:
+            response = await asyncio.to_thread(
+                s3.upload_part, Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=data
+            )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+        finally:
+            slots.release()
+
+    async def queue_part(data):
+        nonlocal upload_id
+        if upload_id is None:
+            created = await asyncio.to_thread(s3.create_multipart_upload, Bucket=bucket, Key=key)
+            upload_id = created["UploadId"]
+        await slots.acquire()
+        for task in tasks:
+            if task.done() and task.exception():
+                slots.release()
+                raise task.exception()
+        tasks.append(asyncio.create_task(send_part(len(tasks) + 1, data)))
+
+    try:
+        async for chunk in chunks:
+            buffer += chunk
+            total += len(chunk)
+            while len(buffer) >= part_size:
+                data = bytes(buffer[:part_size])
+                del buffer[:part_size]
+                await queue_part(data)
+
+        if upload_id is None:
+            await asyncio.to_thread(s3.put_object, Bucket=bucket, Key=key, Body=bytes(buffer))
+        else:
+            if buffer:
+                await queue_part(bytes(buffer))
+                buffer.clear()
+            parts = await asyncio.gather(*tasks)
+            await asyncio.to_thread(
+                s3.complete_multipart_upload,
+                Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        if upload_id is not None:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.to_thread(s3.abort_multipart_upload, Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+
+    seconds = time.perf_counter() - started
+    return {
+        "bytes": total,
+        "parts": len(tasks) or 1,
+        "seconds": round(seconds, 3),
+        "throughput_mb_s": round(total / (1024 * 1024) / seconds, 2) if seconds else None
+    }
+
+
+# ===== Document Analysis Storage =====
+def iter_object_text(body, encoding: str = "utf-8", chunk_size: int = READ_CHUNK) -> Iterator[str]:
+    """
+    Decode an S3 object body (botocore StreamingBody) chunk by chunk.
+
+    The incremental decoder carries multi-byte characters that straddle a
+    read boundary over to the next chunk; undecodable bytes are replaced.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    try:
+        for chunk in body.iter_chunks(chunk_size):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+    finally:
+        body.close()
+
+
+def analysis_key(key: str, config_version: str, claims: bool = False) -> str:
+    """
+    Where the analysis of `key` under a config version is stored: next to the object itself.
+    Analyses with per-claim detail are stored apart from the summary ones.
+    """
+    return f"{key}.analysis-{config_version}{'-claims' if claims else ''}.json"
+
+
+def load_analysis(s3, bucket: str, key: str, config_version: str, etag: str,
+                  claims: bool = False) -> Optional[dict]:
+    """The stored analysis of `key`, or None if there is none for this config version and object ETag."""
+    try:
+        stored = s3.get_object(Bucket=bucket, Key=analysis_key(key, config_version, claims))
+    except s3.exceptions.NoSuchKey:
+        return None
+    analysis = loads(stored["Body"].read())
+    return analysis if analysis.get("etag") == etag else None
+
+
+def store_analysis(s3, bucket: str, key: str, analysis: dict, claims: bool = False):
+    s3.put_object(
+        Bucket=bucket, Key=analysis_key(key, analysis["config_version"], claims),
+        Body=dumps(analysis), ContentType="application/json"
+    )
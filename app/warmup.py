@@ -0,0 +1,114 @@
+import gc
+import logging
+import os
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# ===== Warm-up Config =====
+WARMUP_ENABLED = os.getenv("ROWAN_WARMUP", "1") != "0"
+WARMUP_PASSES = int(os.getenv("ROWAN_WARMUP_PASSES", "2"))
+# Also run a multi-chunk document, which starts the chunk process pool; off by
+# default because every worker then spawns ROWAN_CHUNK_WORKERS processes at boot.
+WARMUP_CHUNK_POOL = os.getenv("ROWAN_WARMUP_CHUNK_POOL", "0") == "1"
+WARMUP_SESSION = "__rowan_warmup__"
+
+_PARAGRAPH = (
+    "The plaintiff argues that the statute must be construed narrowly because it imposes a criminal penalty. "
+    "Clearly the provision was intended to limit liability, and everyone agrees that section 12(b) has no "
+    "retroactive effect. If the regulation applies, then the defendant must prevail. Read in context, the "
+    "enabling act is ambiguous; the agency possibly exceeded its authority without evidence or proof. "
+    "However, the tenant contends the ordinance does not require notice and the court should read it as a whole."
+)
+
+# (user_input, mode): a short claim, an ambiguous fragment the gate holds back,
+# a paragraph in every mode, so each stage and persona path runs at least once.
+WARMUP_INPUTS = (
+    ("Obviously the contract is void because nobody signed it.", None),
+    ("it depends", None),
+    (_PARAGRAPH, None),
+    (_PARAGRAPH, "analysis"),
+    (_PARAGRAPH, "adversarial"),
+    (_PARAGRAPH, "strategy"),
+)
+# Comfortably past ROWAN_CHUNK_TOKENS, so it is analysed in several chunks.
+_LONG_INPUT = " ".join([_PARAGRAPH] * 24)
+
+_status = {"ready": False, "warmup_ms": None, "runs": 0, "error": None, "pid": None}
+
+# ===== Parent Process =====
+def preload():
+    """
+    Build what forked workers can share: the config snapshot with its compiled
+    matchers and canon index, and the statute index mapping.
+
+    Runs in the server's parent before it forks (gunicorn.conf.py). It starts no
+    threads and opens no connections, since neither survives a fork; the
+    config watcher, stage executor and session store start in each worker.
+    The objects built are then frozen out of the garbage collector's reach, so
+    collections in the workers do not write to, and so un-share, their pages.
+    """
+    from engines.Rowan_Config_Registry import registry
+    from engines.Rowan_Statute_Library import preload_statute_library
+
+    start = time.perf_counter()
+    snapshot = registry.current()
+    preload_statute_library()
+    gc.collect()
+    gc.freeze()
+    logger.info("Preloaded config snapshot %s in %.1f ms; %d objects frozen for the workers",
+                snapshot.version, (time.perf_counter() - start) * 1000, gc.get_freeze_count())
+
+# ===== Worker Warm-up =====
+def warm_up(passes: int = WARMUP_PASSES) -> Dict:
+    """
+    Run WARMUP_INPUTS through run_pipeline `passes` times before the worker
+    serves traffic, so lazy imports, thread pools and per-process caches are
+    set up by warm-up requests instead of the first real ones.
+
+    Every run starts from an empty result cache and session, so each one does
+    the full work; warm-up happens before the worker accepts connections, so
+    there are no real entries to lose. Warm-up runs are counted in /metrics
+    like any other pipeline run. A failure is logged and leaves the worker
+    not ready rather than stopping it.
+    """
+    from engines.Rowan_Intention_Engine import RESULT_CACHE, SESSION_STORE
+    from engines.Rowan_Statute_Library import preload_statute_library
+    from orchestrator.orchestrator import run_pipeline
+
+    runs = [(text, mode, None) for text, mode in WARMUP_INPUTS]
+    if WARMUP_CHUNK_POOL:
+        runs.append((_LONG_INPUT, None, None))
+    library = preload_statute_library()
+    if library is not None and len(library):
+        runs.append((_PARAGRAPH, "analysis", library.ids()[0]))
+
+    start = time.perf_counter()
+    count, error = 0, None
+    try:
+        for _ in range(passes):
+            for text, mode, statute_id in runs:
+                RESULT_CACHE.clear()
+                run_pipeline(text, mode, WARMUP_SESSION, statute_id=statute_id)
+                SESSION_STORE.delete(WARMUP_SESSION)
+                count += 1
+    except Exception as e:
+        logger.exception("Warm-up failed after %d runs; this worker will report not ready", count)
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        RESULT_CACHE.clear()
+    elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+    _status.update(ready=error is None, warmup_ms=elapsed_ms, runs=count, error=error, pid=os.getpid())
+    if error is None:
+        logger.info("Worker %d warmed up with %d pipeline runs in %.1f ms", os.getpid(), count, elapsed_ms)
+    return dict(_status)
+
+
+def mark_ready():
+    """For workers started with ROWAN_WARMUP=0: ready as soon as the configs are loaded."""
+    _status.update(ready=True, pid=os.getpid())
+
+
+def readiness() -> Dict:
+    return dict(_status)
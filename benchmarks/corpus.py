@@ -0,0 +1,76 @@
+import random
+from typing import Dict
+
+# ----------------------
+# SIZES
+# ----------------------
+# name -> approximate word count. A brief page is taken as ~500 words.
+CORPUS_SIZES = {
+    "claim": 25,
+    "paragraph": 150,
+    "memo": 1500,
+    "brief": 25000,   # ~50 pages
+}
+
+# ----------------------
+# VOCABULARY
+# ----------------------
+# Fixed rather than drawn from configs/, so a corpus of a given size and seed is
+# the same text across config changes and results stay comparable to a baseline.
+PARTIES = ["the plaintiff", "the defendant", "the agency", "the court", "the employer", "the tenant",
+           "the contractor", "the board", "the petitioner", "the state"]
+SUBJECTS = ["the statute", "section 12(b)", "the provision", "the regulation", "the contract", "the ordinance",
+            "the amendment", "the clause", "subsection (c)", "the enabling act"]
+ACTIONS = ["shall apply", "must be construed narrowly", "may not be enforced", "does not require notice",
+           "cannot impose a criminal penalty", "has no retroactive effect", "was intended to limit liability",
+           "should be read as a whole", "is ambiguous", "includes vehicles and equipment"]
+CONNECTIVES = ["because", "since", "although", "unless", "therefore", "however", "moreover", "and not"]
+CUES = ["clearly", "obviously", "everyone agrees that", "it is evident that", "likely", "possibly",
+        "in plain meaning", "under the ordinary meaning", "read in context", "as a matter of justice",
+        "the simplest explanation is that", "without evidence or proof", "either or", "the inevitable chain means"]
+FILLER = ["in this case", "on the record", "as pleaded", "for these reasons", "under prior precedent",
+          "in the alternative", "at the hearing", "on appeal", "as a threshold matter", "without exception"]
+
+TEMPLATES = [
+    "{cue} {subject} {action}.",
+    "{party} argues that {subject} {action} {filler}.",
+    "If {subject} {action}, then {party} must prevail.",
+    "{party} contends {subject} {action} {connective} {other} {action2}.",
+    "All parties concede {subject} {action} {filler}.",
+    "{cue} {party} cannot rely on {subject} {filler}.",
+    "Nobody disputes that {subject} {action}; {party} {action2} {filler}.",
+]
+
+
+def sentence(rng: random.Random) -> str:
+    text = rng.choice(TEMPLATES).format(
+        cue=rng.choice(CUES), party=rng.choice(PARTIES), subject=rng.choice(SUBJECTS),
+        action=rng.choice(ACTIONS), action2=rng.choice(ACTIONS), other=rng.choice(SUBJECTS),
+        connective=rng.choice(CONNECTIVES), filler=rng.choice(FILLER)
+    )
+    return text[0].upper() + text[1:]
+
+
+def generate_text(words: int, seed: int = 0) -> str:
+    """Synthetic legal prose of about `words` words, split into paragraphs; same seed, same text."""
+    rng = random.Random(seed)
+    paragraphs, paragraph, count = [], [], 0
+    while count < words:
+        s = sentence(rng)
+        paragraph.append(s)
+        count += len(s.split())
+        if len(paragraph) >= rng.randint(4, 9):
+            paragraphs.append(" ".join(paragraph))
+            paragraph = []
+    if paragraph:
+        paragraphs.append(" ".join(paragraph))
+    return "\n\n".join(paragraphs)
+
+
+def generate_corpus(sizes=None, seed: int = 0) -> Dict[str, str]:
+    """{size name: text} for the requested CORPUS_SIZES names (all of them by default)."""
+    sizes = sizes or list(CORPUS_SIZES)
+    unknown = [s for s in sizes if s not in CORPUS_SIZES]
+    if unknown:
+        raise ValueError(f"Unknown corpus sizes: {unknown}; expected some of {list(CORPUS_SIZES)}")
+    return {name: generate_text(CORPUS_SIZES[name], seed) for name in sizes}
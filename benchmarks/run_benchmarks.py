@@ -0,0 +1,219 @@
+"""
+Benchmark each engine and the end-to-end pipeline over synthetic corpora.
+
+    python -m benchmarks.run_benchmarks --output benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json
+
+Run from the repository root. Each case runs on every corpus size (see
+benchmarks/corpus.py) until both --min-runs and --min-time are reached. The
+case records p50/p99 latency, throughput and the peak traced allocation of one
+extra run. With --baseline, any case whose p50 or peak memory grew by more
+than --tolerance is reported and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from benchmarks.corpus import CORPUS_SIZES, generate_corpus
+from engines.Rowan_Config_Registry import current_snapshot
+from engines.Rowan_Intention_Engine import RESULT_CACHE, SESSION_STORE, process_intention
+from engines.Rowan_Logic_Engine import shared_analyzer
+from engines.ReadingLaw_Engine import interpret_statute
+from engines.Specter_Response_Generator import specter_response_engine
+
+# ----------------------
+# CASES
+# ----------------------
+BENCHMARK_SESSION = "benchmark"
+
+
+def reset_pipeline():
+    """Forget cached results and clarification state, so every pipeline run does the full work."""
+    RESULT_CACHE.clear()
+    SESSION_STORE.delete(BENCHMARK_SESSION)
+
+
+class Case(NamedTuple):
+    name: str
+    run: Callable[[str], object]
+    # Untimed, before every run; e.g. clears the result cache so runs measure real work.
+    reset: Optional[Callable[[], None]] = None
+    skipped: Optional[str] = None
+
+
+def _orchestrate_case() -> Case:
+    try:
+        from fastapi.testclient import TestClient
+        from app.main import app
+    except ImportError as e:
+        return Case("orchestrate_http", None, skipped=f"needs the API dependencies: {e}")
+    client = TestClient(app)
+
+    def run(text):
+        response = client.post("/orchestrate", json={"user_input": text, "session_id": BENCHMARK_SESSION})
+        response.raise_for_status()
+        return response.content
+    return Case("orchestrate_http", run, reset_pipeline)
+
+
+def build_cases() -> List[Case]:
+    """Cases in pipeline order; a case whose dependencies are missing is marked skipped."""
+    analyzer = shared_analyzer()
+    cases = [
+        Case("real_engine_process", analyzer.real_engine.process),
+        Case("real_engine_score", lambda text: analyzer.real_engine.process(text, claims=False)),
+        Case("razor_analysis", analyzer.razor_analyzer.analyze),
+        Case("fallacy_analysis", analyzer.fallacy_analyzer.analyze),
+        Case("interpret_statute", lambda text: interpret_statute(text, text)),
+        Case("specter_response_engine", lambda text: specter_response_engine(
+            text, "ANALYSIS MODE | Weighted Score: 0.5", [], [], [], [], seed=0)),
+        Case("process_intention", lambda text: process_intention(text, session_id=BENCHMARK_SESSION), reset_pipeline),
+        _orchestrate_case(),
+    ]
+    return cases
+
+# ----------------------
+# MEASUREMENT
+# ----------------------
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def measure(case: Case, text: str, min_runs: int, max_runs: int, min_time: float) -> Dict:
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_runs and (len(timings) < min_runs or time.perf_counter() - started < min_time):
+        if case.reset:
+            case.reset()
+        start = time.perf_counter()
+        case.run(text)
+        timings.append(time.perf_counter() - start)
+
+    # Peak memory comes from one extra run, since tracing slows the timed ones.
+    if case.reset:
+        case.reset()
+    tracemalloc.start()
+    try:
+        case.run(text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    mean = sum(timings) / len(timings)
+    words = len(text.split())
+    return {
+        "runs": len(timings),
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p99_ms": round(percentile(timings, 99) * 1000, 3),
+        "mean_ms": round(mean * 1000, 3),
+        "ops_per_s": round(1 / mean, 2) if mean else None,
+        "words_per_s": round(words / mean) if mean else None,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run_suite(sizes: List[str], case_names: Optional[List[str]], seed: int,
+              min_runs: int, max_runs: int, min_time: float, log=None) -> Dict:
+    corpus = generate_corpus(sizes, seed)
+    results = {}
+    for case in build_cases():
+        if case_names and case.name not in case_names:
+            continue
+        if case.skipped:
+            results[case.name] = {"skipped": case.skipped}
+            if log:
+                log(f"{case.name}: skipped, {case.skipped}")
+            continue
+        results[case.name] = {}
+        for size, text in corpus.items():
+            results[case.name][size] = measure(case, text, min_runs, max_runs, min_time)
+            if log:
+                r = results[case.name][size]
+                log(f"{case.name:<24} {size:<10} p50 {r['p50_ms']:>10.3f} ms  p99 {r['p99_ms']:>10.3f} ms"
+                    f"  {r['ops_per_s']:>9} ops/s  peak {r['peak_kb']:>9.1f} kB  ({r['runs']} runs)")
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config_version": current_snapshot().version,
+            "seed": seed,
+            "words": {size: len(text.split()) for size, text in corpus.items()},
+        },
+        "results": results,
+    }
+
+# ----------------------
+# BASELINE COMPARISON
+# ----------------------
+COMPARED_METRICS = ("p50_ms", "peak_kb")
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """One row per case, size and metric present in both runs; `regression` marks growth beyond tolerance."""
+    rows = []
+    for case, sizes in current["results"].items():
+        for size, metrics in sizes.items():
+            before = baseline.get("results", {}).get(case, {}).get(size)
+            if not isinstance(metrics, dict) or not isinstance(before, dict):
+                continue
+            for metric in COMPARED_METRICS:
+                if not before.get(metric) or metric not in metrics:
+                    continue
+                ratio = metrics[metric] / before[metric]
+                rows.append({"case": case, "size": size, "metric": metric, "baseline": before[metric],
+                             "current": metrics[metric], "ratio": round(ratio, 3),
+                             "regression": ratio > 1 + tolerance})
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rowan engine and pipeline benchmarks")
+    parser.add_argument("--sizes", default=",".join(CORPUS_SIZES), help=f"comma-separated, from {list(CORPUS_SIZES)}")
+    parser.add_argument("--cases", default="", help="comma-separated case names (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--max-runs", type=int, default=1000)
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds per case and size")
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative growth before a regression")
+    args = parser.parse_args(argv)
+
+    log = lambda line: print(line, file=sys.stderr)
+    results = run_suite([s for s in args.sizes.split(",") if s], [c for c in args.cases.split(",") if c],
+                        args.seed, args.min_runs, args.max_runs, args.min_time, log)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            rows = compare(results, json.load(f), args.tolerance)
+        results["comparison"] = {"baseline": args.baseline, "tolerance": args.tolerance, "rows": rows}
+        regressions = [r for r in rows if r["regression"]]
+        for r in rows:
+            flag = "REGRESSION" if r["regression"] else ""
+            log(f"{r['case']:<24} {r['size']:<10} {r['metric']:<8} {r['baseline']:>10} -> {r['current']:>10}"
+                f"  x{r['ratio']:<6} {flag}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    if regressions:
+        log(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
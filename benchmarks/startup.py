@@ -0,0 +1,121 @@
+"""
+Measure worker cold-start time and fail when it exceeds a budget.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 9 --import-budget-ms 500 --ready-budget-ms 1200
+    python -m benchmarks.startup --workers 16
+
+Run from the repository root. Each run is a fresh interpreter that times
+`import app.main` and then worker-ready: the import plus the app's startup
+handlers (config load and validation, then warm-up). When the API dependencies are not
+installed, the engine entry point orchestrator.orchestrator and a config load
+are timed instead, and the result says so. config_ms is the config load alone
+and rss_kb the worker's peak resident memory. With --workers N, each run starts N
+interpreters at once, as a server booting N workers does, and every one of
+them is counted. The median of --runs is compared with the budgets; the exit
+status is 1 when either is exceeded.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_BUDGET_MS = float(os.getenv("ROWAN_STARTUP_IMPORT_BUDGET_MS", "750"))
+READY_BUDGET_MS = float(os.getenv("ROWAN_STARTUP_READY_BUDGET_MS", "1500"))
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints one JSON line.
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+try:
+    import app.main as target
+    target_name = "app.main"
+except ImportError as e:
+    # Only FastAPI itself being absent is expected (e.g. a bare benchmark box);
+    # any other broken import in the app must fail the check, not hide behind the fallback.
+    if e.name != "fastapi":
+        raise
+    import orchestrator.orchestrator as target
+    target_name, reason = "orchestrator.orchestrator", str(e)
+imported = time.perf_counter()
+from engines.Rowan_Config_Registry import registry
+registry.current()
+configured = time.perf_counter()
+if target_name == "app.main":
+    for handler in target.app.router.on_startup:
+        handler()
+ready = time.perf_counter()
+heavy = sorted(m for m in ("boto3", "botocore", "multiprocessing", "sqlite3", "cProfile", "tracemalloc", "numpy")
+               if m in sys.modules)
+try:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+except ImportError:
+    rss_kb = None
+print(json.dumps({"target": target_name, "fallback_reason": None if target_name == "app.main" else reason,
+                  "import_ms": (imported - start) * 1000, "config_ms": (configured - imported) * 1000,
+                  "ready_ms": (ready - start) * 1000, "rss_kb": rss_kb, "heavy_modules_loaded": heavy}))
+"""
+
+
+def measure_once(workers: int = 1) -> list:
+    """Start `workers` interpreters together; one result per interpreter."""
+    start = time.perf_counter()
+    env = dict(os.environ, PYTHONPATH=ROOT, ROWAN_CONFIG_RELOAD_SECONDS="3600")
+    children = [subprocess.Popen([sys.executable, "-c", CHILD], cwd=ROOT, env=env, text=True,
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE) for _ in range(workers)]
+    results = []
+    for child in children:
+        out, err = child.communicate()
+        if child.returncode:
+            raise subprocess.CalledProcessError(child.returncode, child.args, out, err)
+        result = json.loads(out.strip().splitlines()[-1])
+        result["process_ms"] = (time.perf_counter() - start) * 1000
+        results.append(result)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rowan worker cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--ready-budget-ms", type=float, default=READY_BUDGET_MS)
+    parser.add_argument("--workers", type=int, default=1, help="interpreters started together per run")
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args(argv)
+
+    runs = [result for _ in range(args.runs) for result in measure_once(args.workers)]
+    summary = {
+        "target": runs[0]["target"],
+        "fallback_reason": runs[0]["fallback_reason"],
+        "runs": args.runs,
+        "workers": args.workers,
+        "heavy_modules_loaded": runs[0]["heavy_modules_loaded"],
+    }
+    for metric in ("import_ms", "config_ms", "ready_ms", "process_ms", "rss_kb"):
+        values = sorted(r[metric] for r in runs if r[metric] is not None)
+        if values:
+            summary[metric] = {"median": round(statistics.median(values), 1), "min": round(values[0], 1),
+                               "max": round(values[-1], 1)}
+    budgets = {"import_ms": args.import_budget_ms, "ready_ms": args.ready_budget_ms}
+    summary["budgets"] = budgets
+    over = [m for m, budget in budgets.items() if summary[m]["median"] > budget]
+    summary["over_budget"] = over
+
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    if over:
+        for metric in over:
+            print(f"Over budget: {metric} {summary[metric]['median']} ms > {budgets[metric]} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,11 @@
-import json
+import heapq
 import re
+from collections import defaultdict
+
+from engines.Rowan_Config_Registry import PHASE_SEQUENCE, current_snapshot, registry
+from engines.Rowan_Logic_Engine import KeywordMatcher
+from engines.Rowan_Statute_Library import StatuteSection, statute_library
+from engines.Rowan_Tokenizer import tokenize
 
 # -------------------------
 # CONFIG
@@ -8,22 +14,18 @@ CONFIDENCE_THRESHOLD = 0.9
 LOOKAHEAD_MARGIN = 10
 SAFETY_MARGIN_THRESHOLD = 20
 TOTAL_SCORE_CAP = 500
+ADJUSTMENT_PHASE = "phase_3"   # adjusts existing interpretations instead of adding new ones
+VAGUE_TERMS = ("reasonable", "liberty", "justice", "fair", "etc")
 
 # -------------------------
 # UTILITY FUNCTIONS
 # -------------------------
 def load_canons():
     """
-    Load consolidated canon JSON (CanonInterpretation.json) and return a dictionary keyed by phase_0..phase_3.
-    Each phase contains a list of canon objects.
+    Return the consolidated canons (CanonInterpretation.json) from the current config snapshot,
+    keyed by phase_0..phase_3. Each phase contains a tuple of read-only canon objects.
     """
-    with open("CanonInterpretation.json", "r") as f:
-        data = json.load(f)
-
-    phases = {}
-    for phase_block in data["Legal_Canons"]["phases"]:
-        phases[phase_block["phase"]] = phase_block["canons"]
-    return phases
+    return current_snapshot().canon_phases
 
 
 def normalize_text(text):
@@ -31,31 +33,44 @@ def normalize_text(text):
     return re.sub(r"[^\w\s]", "", text.lower())
 
 
-def calculate_ambiguity(claim, rule_text):
+def count_vague_terms(text_lower):
+    """How many of VAGUE_TERMS occur in the lowercased text."""
+    return sum(1 for v in VAGUE_TERMS if v in text_lower)
+
+
+def calculate_ambiguity(claim, rule_text, analysis_context=None):
     """Compute heuristic ambiguity score based on overlap and vague terms."""
-    vague_terms = ["reasonable", "liberty", "justice", "fair", "etc"]
-    claim_words = set(claim.lower().split())
-    rule_words = set(rule_text.lower().split())
-    overlap = len(claim_words.intersection(rule_words)) / max(len(rule_words), 1)
-    vague_count = sum(1 for v in vague_terms if v in rule_text.lower())
+    claim, rule_text = _tokenized(claim, analysis_context), _tokenized(rule_text, analysis_context)
+    rule_words = rule_text.token_set
+    overlap = len(claim.token_set.intersection(rule_words)) / max(len(rule_words), 1)
+    if isinstance(rule_text, StatuteSection):
+        vague_count = rule_text.vague_count   # counted at ingest
+    else:
+        vague_count = count_vague_terms(rule_text.lower)
     raw_score = (1 - overlap) + (vague_count * 0.2)
     return min(round(raw_score, 2), 1.0)
 
 
+def _tokenized(text, analysis_context=None):
+    """The request's shared TokenizedText when there is a context, else a fresh one."""
+    return analysis_context.text(text) if analysis_context is not None else tokenize(text)
+
+
 def update_confidence(confidence, interpretations):
     """Update confidence score based on margin between top two interpretations."""
     if len(interpretations) < 2:
         return 1.0
-    ranked = sorted(interpretations, key=lambda x: x["score"], reverse=True)
-    gap = ranked[0]["score"] - ranked[1]["score"]
+    first, second = heapq.nlargest(2, interpretations, key=lambda x: x["score"])
+    gap = first["score"] - second["score"]
     confidence += (gap / TOTAL_SCORE_CAP) * 0.5
     return min(round(confidence, 2), 1.0)
 
 
-def safeguard_lookahead(next_phase_canons, top_interpretation, threshold=LOOKAHEAD_MARGIN):
+def safeguard_lookahead(strongest_next_canon, top_interpretation, threshold=LOOKAHEAD_MARGIN):
     """Check if next phase could change outcome significantly."""
-    highest = max(next_phase_canons, key=lambda c: c['weight'])
-    margin = highest["weight"]
+    if strongest_next_canon is None:
+        return False
+    margin = strongest_next_canon["weight"]
     return margin >= threshold
 
 
@@ -64,6 +79,33 @@ def rank_interpretations(interpretations):
     return sorted(interpretations, key=lambda x: x["score"], reverse=True)
 
 
+def rerank_in_place(interpretations):
+    """
+    rank_interpretations without the copy.
+
+    The list is already ranked apart from readings appended (or rescored)
+    since the last call; Timsort finds that ranked run and merges the rest
+    into it in linear time, so keeping the ranking costs about one pass per
+    phase. Ties keep insertion order, as the stable sort always did.
+    """
+    interpretations.sort(key=lambda x: x["score"], reverse=True)
+
+
+def snapshot_interpretations(interpretations):
+    """
+    Per-phase view of the ranked interpretations for the explain log.
+
+    Shallow: in detailed mode phase 3 replaces an interpretation's lists
+    instead of appending to them, so the lists captured here never change.
+    """
+    return tuple(dict(interp) for interp in interpretations)
+
+
+def reading_for(canon):
+    """Interpretation text produced when a canon triggers."""
+    return f"Reading adjusted by {canon['name']}"
+
+
 def create_interpretation(text, score, canons, reasoning, phase):
     """Create a structured interpretation object."""
     return {
@@ -75,16 +117,16 @@ def create_interpretation(text, score, canons, reasoning, phase):
     }
 
 
-def safety_audit(interpretations, unused_canons):
+def safety_audit(interpretations, strongest_unused_canon):
     """
     Stress test: simulate applying strongest unused canon and check stability.
     Returns status and potential impact if un-applied canons would change outcome.
     """
-    if not unused_canons or not interpretations:
+    if strongest_unused_canon is None or not interpretations:
         return {"status": "stable", "impact_detected": False}
 
     top = interpretations[0]
-    highest = max(unused_canons, key=lambda c: c["weight"])
+    highest = strongest_unused_canon
     hypothetical_score = top["score"] + highest["weight"]
 
     impact = hypothetical_score - top["score"]
@@ -97,111 +139,196 @@ def safety_audit(interpretations, unused_canons):
         "impact_detected": impact >= SAFETY_MARGIN_THRESHOLD
     }
 
+# -------------------------
+# CANON TRIGGER INDEX
+# -------------------------
+class CanonIndex:
+    """
+    The canon library compiled for trigger lookup, once per config snapshot.
+
+    Keyword triggers of every phase share one inverted index (a KeywordMatcher
+    from keyword to canon), so the rule text is scanned once for all canons
+    and the cost follows the input size, not the library size. Canons that
+    trigger unconditionally are listed up front. Phase 3 adjustments are
+    resolved ahead of time for every reading an earlier canon can produce.
+    """
+    def __init__(self, canon_phases):
+        self.canon_phases = canon_phases
+        self.always = {}       # phase -> positions of canons that always trigger
+        self.on_context = {}   # phase -> positions that also trigger on any claim words
+        triggers = []
+        for phase in PHASE_SEQUENCE:
+            if phase == ADJUSTMENT_PHASE:
+                continue
+            always, on_context = [], []
+            for order, canon in enumerate(canon_phases.get(phase, ())):
+                trigger = canon["trigger"]
+                if trigger["type"] not in ("always", "keyword", "keyword_or_context"):
+                    continue
+                # An empty keyword is a substring of every text.
+                if trigger["type"] == "always" or "" in trigger["keywords"]:
+                    always.append(order)
+                    continue
+                triggers.extend((k, (phase, order), False) for k in trigger["keywords"])
+                if trigger["type"] == "keyword_or_context":
+                    on_context.append(order)
+            self.always[phase], self.on_context[phase] = always, on_context
+        self.triggers = KeywordMatcher(triggers)
+
+        self.adjusters = canon_phases.get(ADJUSTMENT_PHASE, ())
+        self.adjust_always = [order for order, canon in enumerate(self.adjusters) if "" in canon["trigger"]["keywords"]]
+        self.adjust_triggers = KeywordMatcher(
+            (k, order, False) for order, canon in enumerate(self.adjusters) for k in canon["trigger"]["keywords"]
+        )
+        self.adjustments = {
+            reading_for(canon): self._scan_adjustments(reading_for(canon))
+            for phase in self.always for canon in canon_phases.get(phase, ())
+        }
+
+    def matches(self, rule_lower):
+        """(phase, position) of every canon with a trigger keyword in the lowercased rule text."""
+        return self.triggers.labels_in(rule_lower)
+
+    def triggered(self, rule_lower, has_claim_words, matches=None):
+        """
+        Triggered canons per phase, in library order, from one scan of the lowercased
+        rule text, or from `matches` computed ahead of time (see StatuteSection).
+        """
+        matched = defaultdict(set)
+        for phase, order in (self.matches(rule_lower) if matches is None else matches):
+            matched[phase].add(order)
+        triggered = {}
+        for phase, always in self.always.items():
+            orders = matched[phase].union(always)
+            if has_claim_words:
+                orders.update(self.on_context[phase])
+            canons = self.canon_phases.get(phase, ())
+            triggered[phase] = [canons[order] for order in sorted(orders)]
+        return triggered
+
+    def adjustments_for(self, interpretation):
+        """Phase 3 canons whose keywords occur in an interpretation's text, in library order."""
+        found = self.adjustments.get(interpretation)
+        return found if found is not None else self._scan_adjustments(interpretation)
+
+    def _scan_adjustments(self, interpretation):
+        orders = self.adjust_triggers.labels_in(interpretation.lower())
+        return tuple(self.adjusters[order] for order in sorted(orders.union(self.adjust_always)))
+
+
+registry.register_compiler("canon_index", lambda snapshot: CanonIndex(snapshot.canon_phases))
+
 # -------------------------
 # CORE ENGINE
 # -------------------------
-def interpret_statute(claim, rule_text, mode="json"):
+def interpret_statute(claim, rule_text=None, mode="json", analysis_context=None, section_id=None):
     """
     Interpret a legal provision using consolidated interpretive canons.
     
     Steps:
-    1. Load consolidated canons from CanonInterpretation.json.
+    1. Take consolidated canons from the current config snapshot.
     2. Apply phases sequentially: phase_0, phase_1, phase_2, phase_3.
     3. Track interpretations, confidence, and adjustments.
     4. Return structured analysis.
+
+    claim and rule_text may be strings or TokenizedText. An AnalysisContext,
+    when given, supplies the snapshot and the request's shared tokenization.
+    `section_id` (e.g. "NRS 432B.220") takes the rule text from the statute
+    library instead, with its tokenization, vague terms and trigger scan done at ingest.
     """
-    # Step 1: Load Canons
-    canon_library = load_canons()
+    # Step 1: Load Canons (one snapshot for the whole call)
+    snapshot = analysis_context.snapshot if analysis_context is not None else current_snapshot()
+    if section_id is not None:
+        rule_text = statute_library().section(section_id)
+    claim, rule_text = _tokenized(claim, analysis_context), _tokenized(rule_text, analysis_context)
+    has_claim_words = bool(claim.tokens)
 
     # Step 2: Ambiguity Assessment
-    ambiguity_score = calculate_ambiguity(claim, rule_text)
+    ambiguity_score = calculate_ambiguity(claim, rule_text, analysis_context)
     confidence = 0.2
     interpretations = []
     phases_applied = []
     override_event = False
 
-    # Explainability Log
-    explain_log = []
+    # Explainability Log (only returned, so only recorded, in detailed mode)
+    explain_log = [] if mode == "detailed" else None
 
-    # Phase orchestration sequence
-    phase_sequence = ["phase_0", "phase_1", "phase_2", "phase_3"]
+    # Phase orchestration sequence; one scan of the rule text finds every triggered canon
+    phase_sequence = PHASE_SEQUENCE
+    canon_index = snapshot.compiled("canon_index")
+    if isinstance(rule_text, StatuteSection):
+        triggered = canon_index.triggered(None, has_claim_words, rule_text.canon_matches(snapshot))
+    else:
+        triggered = canon_index.triggered(rule_text.lower, has_claim_words)
 
     for idx, phase in enumerate(phase_sequence):
-        canons = canon_library.get(phase, [])
         applied_canons = []
         reasoning = []
 
-        if phase != "phase_3":
-            # Apply each canon
-            for canon in canons:
-                trigger_type = canon["trigger"]["type"]
-                triggered = False
-
-                # Trigger logic
-                if trigger_type == "always":
-                    triggered = True
-                elif trigger_type == "keyword":
-                    if any(k in rule_text.lower() for k in canon["trigger"]["keywords"]):
-                        triggered = True
-                elif trigger_type == "keyword_or_context":
-                    if any(k in rule_text.lower() for k in canon["trigger"]["keywords"]) or len(claim.split()) > 0:
-                        triggered = True
-
-                if triggered:
-                    applied_canons.append(canon)
-                    reasoning.append(canon["explanation_short"])
-                    interpretations.append(create_interpretation(
-                        f"Reading adjusted by {canon['name']}",
-                        canon["weight"],
-                        [canon],
-                        reasoning.copy(),
-                        phase
-                    ))
+        if phase != ADJUSTMENT_PHASE:
+            # Apply each triggered canon
+            for canon in triggered.get(phase, ()):
+                applied_canons.append(canon)
+                reasoning.append(canon["explanation_short"])
+                # Each reading owns its reasoning list: phase 3 may extend it in place.
+                interpretations.append(create_interpretation(
+                    reading_for(canon),
+                    canon["weight"],
+                    [canon],
+                    reasoning.copy(),
+                    phase
+                ))
 
         else:
             # Phase 3: Score adjustments only
             for interp in interpretations:
-                for canon in canons:
-                    if any(k in interp["interpretation"].lower() for k in canon["trigger"]["keywords"]):
-                        interp["score"] += canon["adjust"]
-                        interp["applied_canons"].append(canon["name"])
-                        interp["reasoning"].append(canon["explanation_short"])
-                        override_event = True
-
-        # Sort interpretations and update confidence
+                adjusters = canon_index.adjustments_for(interp["interpretation"])
+                if not adjusters:
+                    continue
+                override_event = True
+                for canon in adjusters:
+                    interp["score"] += canon["adjust"]
+                names = [canon["name"] for canon in adjusters]
+                notes = [canon["explanation_short"] for canon in adjusters]
+                if explain_log is None:
+                    interp["applied_canons"].extend(names)
+                    interp["reasoning"].extend(notes)
+                else:
+                    # Copy on write, so earlier explain-log snapshots keep their lists.
+                    interp["applied_canons"] = interp["applied_canons"] + names
+                    interp["reasoning"] = interp["reasoning"] + notes
+
+        # Rank in place and update confidence
         phases_applied.append(phase)
-        interpretations = rank_interpretations(interpretations)
+        if applied_canons or phase == ADJUSTMENT_PHASE:
+            rerank_in_place(interpretations)
         confidence = update_confidence(confidence, interpretations)
 
         # Safeguard Lookahead
         if confidence >= CONFIDENCE_THRESHOLD and phase != "phase_3":
             if idx + 1 < len(phase_sequence):
                 next_phase = phase_sequence[idx + 1]
-                if safeguard_lookahead(canon_library[next_phase], interpretations[0]):
+                if safeguard_lookahead(snapshot.strongest_canon[next_phase], interpretations[0]):
                     continue  # Escalate
                 else:
                     break
 
-        explain_log.append({
-            "phase": phase,
-            "triggered_canons": [c["name"] for c in applied_canons],
-            "interpretations": interpretations.copy(),
-            "confidence": confidence
-        })
+        if explain_log is not None:
+            explain_log.append({
+                "phase": phase,
+                "triggered_canons": tuple(c["name"] for c in applied_canons),
+                "interpretations": snapshot_interpretations(interpretations),
+                "confidence": confidence
+            })
 
         if confidence >= CONFIDENCE_THRESHOLD:
             break
 
-    # Final ranking
-    ranked = rank_interpretations(interpretations)
-
-    # Safety Audit: Stress test with remaining canons
-    remaining_canons = []
-    if phases_applied[-1] != phase_sequence[-1]:
-        for later_phase in phase_sequence[phase_sequence.index(phases_applied[-1]) + 1:]:
-            remaining_canons.extend(canon_library.get(later_phase, []))
+    # Final ranking (already ranked after the last phase)
+    ranked = interpretations
 
-    audit_result = safety_audit(ranked, remaining_canons)
+    # Safety Audit: Stress test with the strongest remaining canon
+    audit_result = safety_audit(ranked, snapshot.strongest_after[phases_applied[-1]])
 
     # Output
     if mode == "summary":
@@ -221,3 +348,31 @@ def interpret_statute(claim, rule_text, mode="json"):
             "alternatives": ranked[1:],
             "safety_audit": audit_result
         }
+
+
+def merge_interpretations(results):
+    """
+    Fold JSON-mode interpret_statute() results for chunks of one text into one.
+
+    Interpretations with the same reading keep their best score, ambiguity is
+    averaged, confidence is the weakest chunk's, and the audit reports the
+    first instability any chunk found.
+    """
+    best = {}
+    for result in results:
+        for interp in filter(None, [result["top_interpretation"], *result["alternatives"]]):
+            kept = best.get(interp["interpretation"])
+            if kept is None or interp["score"] > kept["score"]:
+                best[interp["interpretation"]] = interp
+    ranked = rank_interpretations(list(best.values()))
+    phases = {phase for result in results for phase in result["phases_applied"]}
+    audits = [result["safety_audit"] for result in results]
+    return {
+        "ambiguity_score": round(sum(r["ambiguity_score"] for r in results) / len(results), 2),
+        "confidence_score": min(r["confidence_score"] for r in results),
+        "phases_applied": [phase for phase in PHASE_SEQUENCE if phase in phases],
+        "override_event": any(r["override_event"] for r in results),
+        "top_interpretation": ranked[0] if ranked else None,
+        "alternatives": ranked[1:],
+        "safety_audit": next((a for a in audits if a["status"] != "stable"), audits[0])
+    }
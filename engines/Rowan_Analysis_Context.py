@@ -0,0 +1,70 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+from engines.Rowan_Config_Registry import ConfigSnapshot, current_snapshot
+from engines.Rowan_Tokenizer import TokenizedText
+from engines.ReadingLaw_Engine import interpret_statute
+import engines.Rowan_Logic_Engine  # registers the "argument_analyzer" compiler used by logic()
+
+
+class AnalysisContext:
+    """
+    Request-scoped memo shared by the intention, task and Specter layers.
+
+    Each distinct input string gets one TokenizedText, so tokenization and
+    segmentation happen once; the logic evaluation and the canon
+    interpretation are likewise computed at most once per input.
+    The context also pins one config snapshot, so every layer of a request
+    sees the same rules even if a hot reload happens mid-request.
+    `timings` collects per-stage wall times (ms) for the request as stages finish.
+    """
+
+    def __init__(self, snapshot: Optional[ConfigSnapshot] = None):
+        self.snapshot = snapshot or current_snapshot()
+        self._texts: Dict[str, TokenizedText] = {}
+        self._logic: Dict[str, Dict] = {}
+        self._canon: Dict[Tuple[str, str, str], Dict] = {}
+        self.timings: Dict[str, float] = {}
+
+    def text(self, text: Union[str, TokenizedText]) -> TokenizedText:
+        """The one TokenizedText for this string; pass it to engines in place of the string."""
+        if isinstance(text, TokenizedText):
+            return self._texts.setdefault(text.text, text)
+        if text not in self._texts:
+            self._texts[text] = TokenizedText(text)
+        return self._texts[text]
+
+    def lower(self, text: str) -> str:
+        return self.text(text).lower
+
+    def tokens(self, text: str) -> List[str]:
+        """Whitespace tokens of the lowercased text."""
+        return self.text(text).tokens
+
+    def word_set(self, text: str) -> frozenset:
+        return self.text(text).token_set
+
+    def sentence_spans(self, text: str) -> List[Tuple[int, int]]:
+        return self.text(text).sentence_spans
+
+    def logic(self, text: Union[str, TokenizedText]) -> Dict:
+        """
+        evaluate_argument(text) against the pinned snapshot, without per-claim
+        detail: the pipeline reads only the scores, razors and fallacies.
+        """
+        tokenized = self.text(text)
+        if tokenized.text not in self._logic:
+            self._logic[tokenized.text] = self.snapshot.compiled("argument_analyzer").analyze(tokenized, claims=False)
+        return self._logic[tokenized.text]
+
+    def canon(self, claim: Union[str, TokenizedText], rule_text: Union[str, TokenizedText], mode: str = "json") -> Dict:
+        """interpret_statute(claim, rule_text, mode) against the pinned snapshot."""
+        claim, rule_text = self.text(claim), self.text(rule_text)
+        key = (claim.text, rule_text.text, mode)
+        if key not in self._canon:
+            self._canon[key] = interpret_statute(claim, rule_text, mode=mode, analysis_context=self)
+        return self._canon[key]
+
+    def prime(self, text: str, logic: Dict, canon: Dict):
+        """Record results computed elsewhere (e.g. chunk by chunk) for logic(text) and canon(text, text)."""
+        self._logic[text] = logic
+        self._canon[(text, text, "json")] = canon
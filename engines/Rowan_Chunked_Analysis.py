@@ -0,0 +1,232 @@
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Union
+
+from engines.Rowan_Analysis_Context import AnalysisContext
+from engines.Rowan_Config_Registry import current_snapshot, registry
+from engines.Rowan_Tokenizer import TokenizedText, segment_text, tokenize
+from engines.ReadingLaw_Engine import interpret_statute, merge_interpretations
+
+# ----------------------
+# CONFIG
+# ----------------------
+CHUNK_TOKENS = int(os.getenv("ROWAN_CHUNK_TOKENS", "400"))
+# Every server worker process owns its own pool, so by default they split the
+# CPUs between them; ROWAN_SERVER_WORKERS is exported by gunicorn.conf.py. With
+# one server worker per CPU (gunicorn's default) that share is a single CPU,
+# which would run every document inline, so on a multi-core machine each pool
+# keeps at least two processes: a long document on a server that is not busy
+# elsewhere still uses two cores, and under full load the pools oversubscribe
+# the CPUs by at most one process per server worker.
+SERVER_WORKERS = max(int(os.getenv("ROWAN_SERVER_WORKERS", "1")), 1)
+_CPUS = os.cpu_count() or 1
+CHUNK_WORKERS = int(os.getenv("ROWAN_CHUNK_WORKERS", "0")) or max(_CPUS // SERVER_WORKERS, min(_CPUS, 2))
+MAX_SENTENCE_CHARS = 64 * 1024   # streamed text without a sentence delimiter is flushed past this
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def chunk_pool() -> "ProcessPoolExecutor":
+    """
+    Process pool shared by all requests, created on first use.
+
+    Workers are spawned rather than forked: the server process already runs
+    threads (stage executor, config watcher) that a fork would copy mid-lock.
+    multiprocessing is imported here, not at module load: most workers never
+    chunk, and it is the largest import on the engine path.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            _pool = ProcessPoolExecutor(max_workers=CHUNK_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def chunk_text(text: Union[str, TokenizedText], max_tokens: int = CHUNK_TOKENS) -> List[str]:
+    """
+    Split text into chunks of at most `max_tokens` whitespace tokens.
+
+    Chunks end on sentence boundaries, so each chunk segments into the same
+    claims the whole text would. Only a single sentence longer than
+    `max_tokens` is cut mid-sentence.
+    """
+    tokenized = tokenize(text)
+    text = tokenized.text
+    chunks, start, end, count = [], None, None, 0
+    for s_start, s_end in tokenized.sentence_spans:
+        size = tokenized.token_count(s_start, s_end)
+        if start is not None and count + size > max_tokens:
+            chunks.append(text[start:end])
+            start, count = None, 0
+        if size > max_tokens:
+            words = [m.span() for m in re.finditer(r"\S+", text[s_start:s_end])]
+            for i in range(0, size, max_tokens):
+                window = words[i:i + max_tokens]
+                chunks.append(text[s_start + window[0][0]:s_start + window[-1][1]])
+            continue
+        if start is None:
+            start = s_start
+        end, count = s_end, count + size
+    if start is not None:
+        chunks.append(text[start:end])
+    return chunks
+
+
+def analyze_chunk(chunk: str, config_version: str, claims: bool = True, snapshot=None) -> Dict:
+    """
+    Logic and canon results for one chunk; claims=False omits per-claim detail.
+
+    Inline callers pass the request's pinned `snapshot`. Pool workers are sent
+    only `config_version` and resolve it against their own registry.
+    """
+    if snapshot is None:
+        snapshot = current_snapshot()
+        if snapshot.version != config_version:
+            # A long-lived worker may lag a hot reload that the parent already saw.
+            registry.reload()
+            snapshot = current_snapshot()
+    analysis_context = AnalysisContext(snapshot)
+    tokenized = analysis_context.text(chunk)
+    return {
+        "config_version": snapshot.version,
+        "logic": snapshot.compiled("argument_analyzer").analyze(tokenized, claims=claims),
+        "canon": interpret_statute(tokenized, tokenized, analysis_context=analysis_context)
+    }
+
+
+def iter_sentences(text_pieces: Iterable[str], max_chars: int = MAX_SENTENCE_CHARS) -> Iterator[str]:
+    """
+    Yield stripped sentences, as segment_text would, from text arriving in pieces.
+
+    Only the unfinished tail after the last delimiter is buffered. A run of
+    more than `max_chars` without a delimiter is flushed at its last space so
+    the buffer stays bounded.
+    """
+    buffer = ""
+    for piece in text_pieces:
+        buffer += piece
+        cut = max(buffer.rfind("."), buffer.rfind("!"), buffer.rfind("?"))
+        if cut < 0 and len(buffer) > max_chars:
+            cut = buffer.rfind(" ")
+            cut = cut if cut > 0 else len(buffer) - 1
+        if cut >= 0:
+            yield from segment_text(buffer[:cut + 1])
+            buffer = buffer[cut + 1:]
+    yield from segment_text(buffer)
+
+
+def iter_sentence_chunks(sentences: Iterable[str], max_tokens: int = CHUNK_TOKENS) -> Iterator[str]:
+    """Group sentences into chunks of at most `max_tokens` tokens; the streaming counterpart of chunk_text."""
+    group, count = [], 0
+    for sentence in sentences:
+        words = sentence.split()
+        if group and count + len(words) > max_tokens:
+            yield ". ".join(group)
+            group, count = [], 0
+        if len(words) > max_tokens:
+            for i in range(0, len(words), max_tokens):
+                yield " ".join(words[i:i + max_tokens])
+            continue
+        group.append(sentence)
+        count += len(words)
+    if group:
+        yield ". ".join(group)
+
+
+def _map_chunks(chunks: Iterable[str], snapshot, parallel: bool, executor=None,
+                claims: bool = True) -> Iterator[Dict]:
+    """
+    analyze_chunk over `chunks` against `snapshot`, in order.
+
+    In parallel at most two chunks per worker are in flight, so a lazily
+    produced chunk stream is never read far ahead of the workers.
+    """
+    version = snapshot.version
+    if parallel:
+        pool, window = executor or chunk_pool(), 2 * CHUNK_WORKERS
+        inflight = deque()
+        for chunk in chunks:
+            inflight.append(pool.submit(analyze_chunk, chunk, version, claims))
+            if len(inflight) >= window:
+                yield _checked(inflight.popleft().result(), version)
+        while inflight:
+            yield _checked(inflight.popleft().result(), version)
+    else:
+        for chunk in chunks:
+            yield analyze_chunk(chunk, version, claims, snapshot)
+
+
+def _checked(part: Dict, version: str) -> Dict:
+    if part["config_version"] != version:
+        raise ValueError(f"Chunk worker analysed with config {part['config_version']}, expected {version}")
+    return part
+
+
+def analyze_chunked(text: str, analysis_context, max_tokens: int = CHUNK_TOKENS, executor=None) -> Dict:
+    """
+    Run the logic and canon engines over a long text chunk by chunk.
+
+    Chunks go to a process pool (inline with a single worker, where the pool
+    would only add pickling) and the per-chunk results are merged by the
+    engines that produced them. The merged results are primed into
+    `analysis_context`, so later layers of the request reuse them instead of
+    analysing the whole text again. Returns a summary of the chunked run.
+    """
+    started = time.perf_counter()
+    chunks = chunk_text(analysis_context.text(text), max_tokens)
+    parallel = len(chunks) > 1 and CHUNK_WORKERS > 1
+    # Primed for the pipeline, which only reads the scores, so chunks skip per-claim detail.
+    parts = list(_map_chunks(chunks, analysis_context.snapshot, parallel, executor, claims=False))
+
+    analyzer = analysis_context.snapshot.compiled("argument_analyzer")
+    analysis_context.prime(text,
+                           logic=analyzer.merge([p["logic"] for p in parts]),
+                           canon=merge_interpretations([p["canon"] for p in parts]))
+    return {
+        "chunks": len(chunks),
+        "max_tokens": max_tokens,
+        "workers": CHUNK_WORKERS if parallel else 1,
+        "ms": round((time.perf_counter() - started) * 1000, 3)
+    }
+
+
+def analyze_stream(text_pieces: Iterable[str], snapshot=None, max_tokens: int = CHUNK_TOKENS,
+                   executor=None, claims: bool = False) -> Dict:
+    """
+    Logic and canon analysis of a document that arrives as decoded text pieces.
+
+    Sentences are segmented and grouped into chunks lazily, so only the
+    current pieces and the in-flight chunks are held in memory, never the
+    whole document. The logic result carries scores and counts only;
+    `claims=True` adds the per-claim detail, which for a long document is
+    far larger than the document itself.
+    Raises ValueError if the document contains no sentences.
+    """
+    started = time.perf_counter()
+    snapshot = snapshot or current_snapshot()
+    parallel = CHUNK_WORKERS > 1
+    chunks = iter_sentence_chunks(iter_sentences(text_pieces), max_tokens)
+    logic_parts, canon_parts = [], []
+    for part in _map_chunks(chunks, snapshot, parallel, executor, claims):
+        logic_parts.append(part["logic"])
+        canon_parts.append(part["canon"])
+    if not logic_parts:
+        raise ValueError("Document contains no text to analyse")
+
+    return {
+        "config_version": snapshot.version,
+        "logic": snapshot.compiled("argument_analyzer").merge(logic_parts),
+        "canon": merge_interpretations(canon_parts),
+        "chunking": {
+            "chunks": len(logic_parts),
+            "max_tokens": max_tokens,
+            "workers": CHUNK_WORKERS if parallel else 1,
+            "ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+    }
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# CONFIG
+# -------------------------
+CONFIG_DIR = os.getenv(
+    "ROWAN_CONFIG_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "configs")
+)
+RELOAD_INTERVAL = float(os.getenv("ROWAN_CONFIG_RELOAD_SECONDS", "5"))
+
+LOGIC_RULES_FILE = "All_Logic_Rules.json"
+HEURISTICS_FILE = "RazorsAndTraps.json"
+CANONS_FILE = "CanonInterpretation.json"
+CONFIG_FILES = (LOGIC_RULES_FILE, HEURISTICS_FILE, CANONS_FILE)
+
+PHASE_SEQUENCE = ("phase_0", "phase_1", "phase_2", "phase_3")
+
+# -------------------------
+# VALIDATION
+# -------------------------
+def _require(condition, source, message):
+    if not condition:
+        raise ValueError(f"{source}: {message}")
+
+
+def _validate_keyword_rules(rules, source, label):
+    _require(isinstance(rules, list), source, f"{label} must be a list")
+    for rule in rules:
+        _require(isinstance(rule, dict) and "name" in rule, source, f"every entry in {label} needs a name")
+        _require(isinstance(rule.get("keywords", []), list), source, f"{rule['name']}: keywords must be a list")
+
+
+def validate_logic_rules(data):
+    source = LOGIC_RULES_FILE
+    _require(isinstance(data, dict), source, "top level must be an object")
+    bundle = data.get("rhetoric_rules", {})
+    _require(isinstance(bundle, dict), source, "rhetoric_rules must be an object")
+    _validate_keyword_rules(bundle.get("tags", []), source, "rhetoric_rules.tags")
+    for mode, entry in bundle.get("classification", {}).items():
+        _require(isinstance(entry.get("keywords", []), list), source, f"classification.{mode}.keywords must be a list")
+    _require(isinstance(bundle.get("anchors", {}), dict), source, "anchors must be an object")
+    for section in ("style_devices", "advanced_cues"):
+        for name, words in bundle.get(section, {}).items():
+            _require(isinstance(words, list), source, f"{section}.{name} must be a list")
+
+
+def validate_heuristics(data):
+    source = HEURISTICS_FILE
+    _require(isinstance(data, dict) and "Reasoning_Heuristics" in data, source, "missing Reasoning_Heuristics")
+    heuristics = data["Reasoning_Heuristics"]
+    for section, key in (("Mind_Traps", "traps"), ("Philosophical_Razors", "razors")):
+        rules = heuristics.get(section, {}).get(key, [])
+        _validate_keyword_rules(rules, source, f"{section}.{key}")
+        for rule in rules:
+            # Summed into adjusted_score on every request.
+            weight = rule.get("weight", 0)
+            _require(isinstance(weight, (int, float)) and not isinstance(weight, bool), source,
+                     f"{rule['name']}: weight must be a number")
+
+
+def validate_canons(data):
+    source = CANONS_FILE
+    _require(isinstance(data, dict) and "Legal_Canons" in data, source, "missing Legal_Canons")
+    phases = {block.get("phase"): block for block in data["Legal_Canons"].get("phases", [])}
+    for phase in PHASE_SEQUENCE:
+        _require(phase in phases, source, f"missing {phase}")
+        for canon in phases[phase].get("canons", []):
+            name = canon.get("name")
+            _require(name, source, f"{phase}: every canon needs a name")
+            _require(isinstance(canon.get("weight"), (int, float)), source, f"{name}: weight must be a number")
+            trigger = canon.get("trigger", {})
+            _require("type" in trigger, source, f"{name}: trigger.type is required")
+            _require(isinstance(trigger.get("keywords", []), list), source, f"{name}: trigger.keywords must be a list")
+            _require("explanation_short" in canon, source, f"{name}: explanation_short is required")
+            if phase == "phase_3":
+                _require(isinstance(canon.get("adjust"), (int, float)), source, f"{name}: phase_3 canons need adjust")
+
+# -------------------------
+# SNAPSHOTS
+# -------------------------
+def freeze(value):
+    """Recursively convert dicts and lists to read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class ConfigSnapshot:
+    """
+    One immutable, validated view of the rule and canon configs.
+
+    Engines read everything for a request from a single snapshot, so a reload
+    mid-request never mixes old and new rules. `compiled(name)` returns
+    structures derived from this snapshot by registered compilers.
+    """
+
+    def __init__(self, version, stamps, logic_rules, heuristics, canons, compilers=None):
+        self.version = version
+        self.stamps = stamps
+        self.loaded_at = time.time()
+
+        heuristics = heuristics["Reasoning_Heuristics"]
+        self.logic_config = freeze({
+            "logic_rules": logic_rules.get("logic_rules", {}),
+            "rhetoric_rules": logic_rules.get("rhetoric_rules", {}),
+            "rhetoric_rules_expanded": logic_rules.get("rhetoric_rules_expanded", {}),
+            "macro_logic_checks": logic_rules.get("macro_logic_checks", {}),
+            "razors": heuristics.get("Philosophical_Razors", {}),
+            "fallacies": heuristics.get("Mind_Traps", {})
+        })
+
+        phases = {block["phase"]: block.get("canons", []) for block in canons["Legal_Canons"]["phases"]}
+        self.canon_phases = freeze(phases)
+
+        # Strongest canon per phase (safeguard_lookahead) and strongest canon in
+        # all phases after a phase (safety_audit); ties keep the first canon, as max() does.
+        strongest, strongest_after = {}, {}
+        for idx, phase in enumerate(PHASE_SEQUENCE):
+            canons_in_phase = self.canon_phases.get(phase, ())
+            strongest[phase] = max(canons_in_phase, key=lambda c: c["weight"]) if canons_in_phase else None
+            later = [c for p in PHASE_SEQUENCE[idx + 1:] for c in self.canon_phases.get(p, ())]
+            strongest_after[phase] = max(later, key=lambda c: c["weight"]) if later else None
+        self.strongest_canon = MappingProxyType(strongest)
+        self.strongest_after = MappingProxyType(strongest_after)
+
+        self._compilers = compilers if compilers is not None else {}
+        self._compiled = {}
+        self._compile_lock = threading.Lock()
+
+    def compiled(self, name):
+        try:
+            return self._compiled[name]
+        except KeyError:
+            pass
+        with self._compile_lock:
+            if name not in self._compiled:
+                self._compiled[name] = self._compilers[name](self)
+            return self._compiled[name]
+
+# -------------------------
+# REGISTRY
+# -------------------------
+class ConfigRegistry:
+    """
+    Process-wide holder of the current ConfigSnapshot.
+
+    Readers only dereference `self._snapshot`, which is replaced in a single
+    assignment, so a reload never blocks or disturbs in-flight requests.
+    """
+
+    def __init__(self, config_dir: str = CONFIG_DIR):
+        self.config_dir = config_dir
+        self.compilers: Dict[str, Callable] = {}
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._reload_lock = threading.Lock()
+        self._failed_stamps = None
+        self._watcher = None
+
+    def register_compiler(self, name: str, compiler: Callable):
+        """Register a function that derives a structure from a snapshot; it runs before each swap."""
+        self.compilers[name] = compiler
+
+    def current(self) -> ConfigSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            # Nothing has loaded yet, so there is no last good snapshot to fall back on:
+            # retry even files that already failed, and let their error reach the caller.
+            self.reload(force=True)
+            snapshot = self._snapshot
+        return snapshot
+
+    def _stamps(self):
+        stamps = []
+        for name in CONFIG_FILES:
+            stat = os.stat(os.path.join(self.config_dir, name))
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stamps)
+
+    def _build(self, stamps):
+        raw = []
+        for name in CONFIG_FILES:
+            with open(os.path.join(self.config_dir, name), "rb") as f:
+                raw.append(f.read())
+        version = hashlib.sha256(b"\0".join(raw)).hexdigest()[:12]
+        logic_rules, heuristics, canons = (json.loads(data) for data in raw)
+        validate_logic_rules(logic_rules)
+        validate_heuristics(heuristics)
+        validate_canons(canons)
+
+        snapshot = ConfigSnapshot(version, stamps, logic_rules, heuristics, canons, self.compilers)
+        for name in list(self.compilers):
+            snapshot.compiled(name)
+        return snapshot
+
+    def reload(self, force: bool = False) -> bool:
+        """Rebuild the snapshot if any config file changed. Returns True if a new version was published."""
+        with self._reload_lock:
+            stamps = self._stamps()
+            current = self._snapshot
+            if not force and stamps == self._failed_stamps:
+                return False
+            if current is not None and not force and stamps == current.stamps:
+                return False
+            try:
+                snapshot = self._build(stamps)
+            except ValueError:
+                self._failed_stamps = stamps
+                raise
+            except (KeyError, TypeError, AttributeError) as e:
+                # A config of the wrong shape that slipped past validate_* and
+                # tripped a compiler: report it as an invalid config like any other.
+                self._failed_stamps = stamps
+                raise ValueError(f"Invalid config ({type(e).__name__}: {e})") from e
+            if current is not None and snapshot.version == current.version:
+                current.stamps = stamps
+                return False
+            self._snapshot = snapshot
+            logger.info("Loaded config snapshot %s", snapshot.version)
+            return True
+
+    def watch(self, interval: float = RELOAD_INTERVAL):
+        """Start a daemon thread that polls the config files and hot-swaps on change."""
+        if self._watcher is not None or interval <= 0:
+            return
+
+        def poll():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.reload()
+                except Exception:
+                    # Keep serving the last good snapshot until the files are fixed;
+                    # nothing may end this thread, or hot reload stops for good.
+                    logger.exception("Config reload failed; keeping snapshot %s", getattr(self._snapshot, "version", None))
+
+        self._watcher = threading.Thread(target=poll, name="config-registry-watcher", daemon=True)
+        self._watcher.start()
+
+
+registry = ConfigRegistry()
+
+
+def current_snapshot() -> ConfigSnapshot:
+    return registry.current()
@@ -1,14 +1,43 @@
+from concurrent.futures import wait
+from typing import Union
+
+from engines.Rowan_Analysis_Context import AnalysisContext
+from engines.Rowan_Chunked_Analysis import analyze_chunked
+from engines.Rowan_Result_Cache import ResultCache, SingleFlight, normalize_input, result_cache_key
+from engines.Rowan_Session_Store import create_session_store
+from engines.Rowan_Statute_Library import statute_library
+from engines.Rowan_Task_Engine import canon_stage, task_engine
+from engines.Rowan_Tokenizer import TokenizedText, tokenize
+from orchestrator.metrics import METRICS, stage_timer
+from orchestrator.scheduler import STAGE_EXECUTOR
+
+# ----------------------
+# SESSION STORE
 # ----------------------
-# GLOBAL SESSION CONTEXT
+# Bounded in-memory LRU+TTL by default; ROWAN_SESSION_STORE=sqlite:///path shares it across workers.
+SESSION_STORE = create_session_store()
+
+# ----------------------
+# RESULT CACHE
 # ----------------------
-SESSION_CONTEXT = {}
+# Holds everything after the ambiguity gate, which depends only on the merged
+# input, the mode and the config version; the gate itself always runs.
+RESULT_CACHE = ResultCache()
+METRICS.callback("rowan_result_cache_hits_total", "Result cache hits.", lambda: RESULT_CACHE.hits, kind="counter")
+METRICS.callback("rowan_result_cache_misses_total", "Result cache misses.", lambda: RESULT_CACHE.misses, kind="counter")
+
+# Concurrent cache misses for the same key (e.g. a team opening a shared brief
+# at once) wait for one evaluation instead of each running the pipeline.
+IN_FLIGHT = SingleFlight()
+METRICS.callback("rowan_requests_coalesced_total", "Requests that waited for an identical in-flight evaluation.",
+                 lambda: IN_FLIGHT.coalesced, kind="counter")
 
 # ----------------------
 # CLARITY-BASED AMBIGUITY SCORING
 # ----------------------
-def calculate_ambiguity_score(user_input: str) -> float:
-    text = user_input.lower()
-    tokens = text.split()
+def calculate_ambiguity_score(user_input: Union[str, TokenizedText], analysis_context: AnalysisContext = None) -> float:
+    tokenized = analysis_context.text(user_input) if analysis_context is not None else tokenize(user_input)
+    tokens, token_set = tokenized.tokens, tokenized.token_set
     score = 0
 
     # Short query is usually ambiguous
@@ -17,16 +46,16 @@ def calculate_ambiguity_score(user_input: str) -> float:
 
     # Vague terms that kill clarity
     vague_terms = {"do", "make", "thing", "stuff", "handle", "help", "fix"}
-    if any(term in tokens for term in vague_terms):
+    if not token_set.isdisjoint(vague_terms):
         score += 0.3
 
     # Missing domain-specific keywords
     domain_keywords = {"statute", "rule", "motion", "injunction", "file", "analyze", "draft", "simulate", "review"}
-    if not any(k in tokens for k in domain_keywords):
+    if token_set.isdisjoint(domain_keywords):
         score += 0.3
 
     # Ambiguous question without constraints
-    if "?" in text and len(tokens) < 8:
+    if "?" in tokenized.text and len(tokens) < 8:
         score += 0.2
 
     return min(score, 1.0)
@@ -49,84 +78,185 @@ def build_clarification_prompts(needs: list) -> list:
 # ----------------------
 # CONTEXT-AWARE COMPLETENESS CHECK
 # ----------------------
-def determine_needs(user_input: str, logic_result: dict, mode: str = None):
+LEGAL_KEYWORDS = ("statute", "rule", "canon", "precedent", "section", "motion")
+
+def needs_canon(user_input: Union[str, TokenizedText], analysis_context: AnalysisContext = None) -> bool:
+    """The "canon" need of determine_needs, which depends on the text alone."""
+    text = (analysis_context.text(user_input) if analysis_context is not None else tokenize(user_input)).lower
+    return not any(k in text for k in LEGAL_KEYWORDS)
+
+def determine_needs(user_input: Union[str, TokenizedText], logic_result: dict, mode: str = None,
+                    analysis_context: AnalysisContext = None):
     needs = []
-    text = user_input.lower()
+    tokenized = analysis_context.text(user_input) if analysis_context is not None else tokenize(user_input)
+    tokens = tokenized.tokens
 
-    if logic_result["adjusted_score"] < 0.8 or logic_result["fallacies"]["detected_fallacies"]:
+    if logic_result["adjusted_score"] < 0.8 or logic_result["fallacies"]:
         needs.append("logic")
 
-    legal_keywords = ["statute", "rule", "canon", "precedent", "section", "motion"]
-    if not any(k in text for k in legal_keywords):
+    if needs_canon(tokenized, analysis_context):
         needs.append("canon")
 
     persuasive_razors = {"Hanlon's Razor", "Sagan's Standard", "Occam's Razor"}
-    matched_razors = {r["razor"] for r in logic_result["razors"]["matched_razors"]}
+    matched_razors = {r["razor"] for r in logic_result["razors"]}
     if matched_razors & persuasive_razors:
         needs.append("bias_control")
 
-    if len(text.split()) > 60 or logic_result["status"] == "uncertain":
+    if len(tokens) > 60 or logic_result["status"] == "uncertain":
         needs.append("depth_analysis")
 
     return needs if needs else ["none"]
 
+# ----------------------
+# MODE DETECTION
+# ----------------------
+def determine_mode(user_input: Union[str, TokenizedText], analysis_context: AnalysisContext = None) -> str:
+    text = (analysis_context.text(user_input) if analysis_context is not None else tokenize(user_input)).lower
+    if any(k in text for k in ["rebut", "counter", "attack", "opposing", "cross-exam"]):
+        return "adversarial"
+    if any(k in text for k in ["strategy", "strategic", "plan", "approach"]):
+        return "strategy"
+    return "analysis"
+
 # ----------------------
 # MAIN INTENTION ENGINE
 # ----------------------
-def process_intention(user_input: str, mode: str = None, session_id: str = "default"):
-    context = SESSION_CONTEXT.get(session_id, {"attempts": 0})
-    merged_input = user_input if not context.get("clarification_needed") else context["last_query"] + " " + user_input
-
-    # STEP 1: Ambiguity Gate
-    ambiguity_score = calculate_ambiguity_score(merged_input)
-    if ambiguity_score >= 0.6:
-        context.update({
-            "last_query": merged_input,
-            "clarification_needed": True,
-            "attempts": context["attempts"] + 1
-        })
-        SESSION_CONTEXT[session_id] = context
-
-        if context["attempts"] >= 3:
+def process_intention(user_input: str, mode: str = None, session_id: str = "default",
+                      analysis_context: AnalysisContext = None, on_event=None, statute_id: str = None,
+                      use_cache: bool = True):
+    """
+    Gate, evaluate and hand off one request. `on_event(name, data)`, if given,
+    is called as each stage finishes: ambiguity_gate, logic_evaluation, then the
+    task engine's canon_interpretation, weighting and persona.
+    Stage wall times are recorded in the stage metrics and in analysis_context.timings.
+    `statute_id` names a statute library section to interpret the input against;
+    an unknown id raises KeyError before any work is done.
+    `use_cache=False` always evaluates here, neither reading nor filling the
+    result cache nor joining an identical in-flight evaluation (e.g. when profiling).
+    A result served from the cache or shared with an identical in-flight request
+    carries no stage timings of its own (see without_timings).
+    """
+    analysis_context = analysis_context or AnalysisContext()
+    statute, statute_key = None, ""
+    if statute_id:
+        library = statute_library()
+        statute = library.section(statute_id)
+        statute_key = f"{statute.section_id}@{library.version}"
+    emit = on_event or (lambda name, data: None)
+    # Session state is read, updated and saved under that session's lock.
+    with SESSION_STORE.session(session_id) as context:
+        merged_input = user_input if not context.get("clarification_needed") else context["last_query"] + " " + user_input
+        merged_input = normalize_input(merged_input)
+
+        # STEP 1: Ambiguity Gate
+        with stage_timer("ambiguity_gate", analysis_context.timings):
+            ambiguity_score = calculate_ambiguity_score(merged_input, analysis_context)
+        emit("ambiguity_gate", {"clarity_score": 1.0 - ambiguity_score, "passed": ambiguity_score < 0.6})
+        if ambiguity_score >= 0.6:
+            context.update({
+                "last_query": merged_input,
+                "clarification_needed": True,
+                "attempts": context["attempts"] + 1
+            })
+
+            if context["attempts"] >= 3:
+                return {
+                    "status": "failed",
+                    "reason": "Too many unclear attempts.",
+                    "clarity_score": ambiguity_score,
+                    "required": ["specific claim", "statutory reference", "desired action"],
+                    "feedback": "Cannot proceed without essential details."
+                }
+
+            dummy_logic_result = {"adjusted_score": 0, "status": "fail", "razors": [], "fallacies": []}
+            needs = determine_needs(merged_input, dummy_logic_result, mode, analysis_context)
             return {
-                "status": "failed",
-                "reason": "Too many unclear attempts.",
+                "status": "clarification_needed",
                 "clarity_score": ambiguity_score,
-                "required": ["specific claim", "statutory reference", "desired action"],
-                "feedback": "Cannot proceed without essential details."
+                "feedback": "Input lacks specificity.",
+                "required": needs,
+                "prompts": build_clarification_prompts(needs)
             }
 
-        dummy_logic_result = {"adjusted_score": 0, "status": "fail", "razors": {"matched_razors": []}, "fallacies": {"detected_fallacies": []}}
-        needs = determine_needs(merged_input, dummy_logic_result, mode)
-        return {
-            "status": "clarification_needed",
-            "clarity_score": ambiguity_score,
-            "feedback": "Input lacks specificity.",
-            "required": needs,
-            "prompts": build_clarification_prompts(needs)
-        }
+        context.update({"clarification_needed": False, "attempts": 0})
+
+    # Everything below is a pure function of (merged_input, mode, config version).
+    # Streaming callers bypass the cache and coalescing so they still see every stage event,
+    # and profiled ones so the profile shows the work rather than a cache hit or a wait.
+    key = result_cache_key(merged_input, mode, analysis_context.snapshot.version, statute_key)
+    if on_event is not None or not use_cache:
+        return evaluate_intention(merged_input, mode, ambiguity_score, analysis_context, on_event, seed=key,
+                                  statute=statute)
+
+    with stage_timer("result_cache", analysis_context.timings):
+        cached = RESULT_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    evaluated_here = []
 
-    context.update({"clarification_needed": False, "attempts": 0})
-    SESSION_CONTEXT[session_id] = context
+    def evaluate():
+        evaluated_here.append(True)
+        result = evaluate_intention(merged_input, mode, ambiguity_score, analysis_context, seed=key, statute=statute)
+        if not result["status"].endswith("_error"):
+            RESULT_CACHE.put(key, without_timings(result))
+        return result
 
+    result = IN_FLIGHT.run(key, evaluate)
+    # A request that waited for an identical one gets that request's result, not its timings.
+    return result if evaluated_here else without_timings(result)
+
+def without_timings(result: dict) -> dict:
+    """
+    A copy of an evaluate_intention result with its stage timings (handoff
+    "timings", chunking "ms") set to None, for requests that did not do the
+    work: cache hits and coalesced waiters. Their own timings, when asked for,
+    come from their AnalysisContext.
+    """
+    result = dict(result)
+    if result.get("handoff") is not None:
+        result["handoff"] = dict(result["handoff"], timings=None)
+    if result.get("chunking") is not None:
+        result["chunking"] = dict(result["chunking"], ms=None)
+    return result
+
+def evaluate_intention(merged_input: str, mode, ambiguity_score: float, analysis_context: AnalysisContext,
+                       on_event=None, seed=None, statute=None):
+    """Steps 2-7 of process_intention; `seed` makes the persona layer deterministic."""
+    emit = on_event or (lambda name, data: None)
+    timings = analysis_context.timings
     # STEP 2: Feasibility Gate
-    tokens = merged_input.split()
+    # Broad requests are analysed in sentence-aligned chunks across worker processes;
+    # the merged results are primed into analysis_context for the steps below.
+    tokens = analysis_context.tokens(merged_input)
     complexity_score = len(tokens) / 60
+    chunking = None
     if complexity_score > 1.0:
-        return {
-            "status": "proceed_with_warning",
-            "reason": "Request is broad; may require multiple steps.",
-            "feedback": f"Complexity score: {complexity_score:.2f}. Execution may need chunking."
-        }
+        try:
+            with stage_timer("chunked_analysis", timings):
+                chunking = analyze_chunked(merged_input, analysis_context)
+        except Exception as e:
+            return {"status": "logic_error", "error": str(e)}
+        emit("chunked_analysis", dict(chunking, complexity_score=round(complexity_score, 2)))
 
     # STEP 3: Mode Detection
     if not mode:
-        mode = determine_mode(merged_input)
+        with stage_timer("mode_detection", timings):
+            mode = determine_mode(merged_input, analysis_context)
 
     # STEP 4: Logic Gate
+    # Whether the task engine's canon stage runs depends on the text alone, so
+    # the interpretation starts now and overlaps the logic gate; the canon stage
+    # then reads it from analysis_context.
+    canon_future = None
+    if statute is not None or needs_canon(merged_input, analysis_context):
+        canon_future = STAGE_EXECUTOR.submit(_interpret_statute, merged_input, analysis_context, statute)
     try:
-        logic_result = evaluate_argument(merged_input)
+        with stage_timer("evaluate_argument", timings):
+            logic_result = analysis_context.logic(merged_input)
     except Exception as e:
+        if canon_future is not None:
+            wait([canon_future])   # it writes to analysis_context.timings
         return {"status": "logic_error", "error": str(e)}
 
     adjusted_score = logic_result["adjusted_score"]
@@ -140,23 +270,42 @@ def process_intention(user_input: str, mode: str = None, session_id: str = "defa
     else:
         status, warning = "processed", None
 
+    logic_evaluation = {
+        "status": logic_result["status"],
+        "logic_score": logic_result["logic"]["logic_score"],
+        "adjusted_score": adjusted_score,
+        "razor_bonus": logic_result["modifiers"]["razor_bonus"],
+        "fallacy_penalty": logic_result["modifiers"]["fallacy_penalty"],
+        "detected_razors": logic_result["razors"],
+        "detected_fallacies": logic_result["fallacies"],
+        "explanations": logic_result["explanations"]
+    }
+    emit("logic_evaluation", dict(logic_evaluation, gate_status=status, warning=warning))
+
     # STEP 5: Completeness Check
-    needs = determine_needs(merged_input, logic_result, mode)
+    with stage_timer("completeness", timings):
+        needs = determine_needs(merged_input, logic_result, mode, analysis_context)
     meta_directive = {"mode": mode, "execution_policy": {"mode": mode, "needs": needs}}
 
     # STEP 6: Inverse Razor Reasoning (Adversarial Mode)
     inverse_razors = []
     if mode in ["adversarial", "argument_testing"]:
-        for razor in logic_result["razors"]["matched_razors"]:
+        razor_rules = analysis_context.snapshot.logic_config["razors"].get("razors", ())
+        for razor in logic_result["razors"]:
             inverse_razors.append({
                 "razor": razor["razor"],
-                "counter": next((r["inverse"]["principle"] for r in RAZORS["Philosophical_Razors"]["razors"] if r["name"] == razor["razor"]), "")
+                "counter": next((r.get("inverse_principle", "") for r in razor_rules if r["name"] == razor["razor"]), "")
             })
 
     # STEP 7: Task Engine Handoff
     try:
-        task_payload = {"mode": mode, "user_input": merged_input, "directive": meta_directive}
-        task_result = task_engine(task_payload)
+        if canon_future is not None:
+            canon_future.result()
+        task_payload = {"mode": mode, "user_input": merged_input, "directive": meta_directive,
+                        "analysis_context": analysis_context, "on_event": on_event, "seed": seed,
+                        "statute": statute}
+        with stage_timer("task_engine", timings):
+            task_result = task_engine(task_payload)
     except Exception as e:
         return {"status": "task_engine_error", "error": str(e)}
 
@@ -164,30 +313,23 @@ def process_intention(user_input: str, mode: str = None, session_id: str = "defa
         "status": status,
         "mode": mode,
         "clarity_score": 1.0 - ambiguity_score,
-        "logic_evaluation": {
-            "status": logic_result["status"],
-            "logic_score": logic_result["logic"]["logic_score"],
-            "adjusted_score": adjusted_score,
-            "razor_bonus": logic_result["modifiers"]["razor_bonus"],
-            "fallacy_penalty": logic_result["modifiers"]["fallacy_penalty"],
-            "detected_razors": logic_result["razors"]["matched_razors"],
-            "detected_fallacies": logic_result["fallacies"]["detected_fallacies"],
-            "explanations": logic_result["explanations"]
-        },
+        "logic_evaluation": logic_evaluation,
         "inverse_razors": inverse_razors if inverse_razors else None,
         "meta_directive": meta_directive,
         "handoff": task_result,
         "prompts": build_clarification_prompts(needs),
-        "warning": warning
+        "warning": warning,
+        "chunking": chunking
     }
 
+def _interpret_statute(merged_input: str, analysis_context: AnalysisContext, statute):
+    with stage_timer("interpret_statute", analysis_context.timings):
+        canon_stage(merged_input, analysis_context, statute)
+
 # ----------------------
 # TEST EXAMPLE
 # ----------------------
 if __name__ == "__main__":
-    from Rowan_Logic_Engine import evaluate_argument, RAZORS
-    from Rowan_Task_Engine import task_engine
-    from Rowan_Mode_Engine import determine_mode
     user_input = "This is a test input." # Placeholder for actual user input
     mode = None
     session_id = "default"
@@ -1,82 +1,356 @@
-import json
 import os
 import re
+from bisect import bisect_right
 from collections import defaultdict
-from typing import List, Dict
+from itertools import chain
+from types import MappingProxyType
+from typing import List, Dict, Iterable, NamedTuple, Optional, Tuple, Union
+
+from engines.Rowan_Config_Registry import current_snapshot, registry
+from engines.Rowan_Tokenizer import TokenizedText, normalize_text, segment_spans, segment_text, tokenize
+
+Text = Union[str, TokenizedText]
 
 # ===================================
-# Utility Functions
+# Load Config
 # ===================================
-def normalize_text(text: str) -> str:
-    return re.sub(r'[^a-z0-9\s]', '', text.lower())
+def load_config():
+    """Logic, rhetoric, razor and trap rules from the current config snapshot (read-only)."""
+    return current_snapshot().logic_config
 
-def segment_text(text: str) -> List[str]:
-    return [c.strip() for c in re.split(r'[.!?]', text) if c.strip()]
+# ===================================
+# Keyword Matching
+# ===================================
+# Built-in cues behind the logical checks, rhetorical purpose and semantic flags.
+# name -> (keywords, word_bounded)
+CLAIM_CUES = {
+    "verb": (["is", "are", "was", "were", "has", "have", "do", "does", "cannot", "must"], True),
+    "contradiction": ([" and not "], False),
+    "if": (["if"], False),
+    "then": (["then"], False),
+    "quantifier": (["all", "none", "everybody", "nobody"], False),
+    "modal": (["must", "should", "necessary", "possible"], False),
+    "gratitude": (["thank", "grateful"], False),
+    "moral_principle": (["justice", "freedom"], False),
+    "assumed_agreement": (["clearly", "obviously", "undeniably", "it is evident", "it is clear"], True),
+    "speculative": (["likely", "may", "could", "possibly", "expected"], True),
+}
+
+# Below this many keywords, labels_in() tests each keyword directly instead of running the trie regex.
+DIRECT_SCAN_MAX_KEYWORDS = 96
+
+class KeywordHit(NamedTuple):
+    start: int
+    end: int
+    keyword: str
+    label: Tuple  # (category, order, name)
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+def _at_word_boundaries(text: str, start: int, end: int) -> bool:
+    """Equivalent of wrapping the match in \\b...\\b."""
+    def boundary(i):
+        before = i > 0 and _is_word_char(text[i - 1])
+        after = i < len(text) and _is_word_char(text[i])
+        return before != after
+    return boundary(start) and boundary(end)
+
+def _trie_pattern(node: Dict) -> str:
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return "(?:" + body + ")?" if "" in node else body
+
+class KeywordMatcher:
+    """
+    Matches a fixed keyword set in one left-to-right pass.
+
+    Keywords are compiled into a single trie-shaped regex, so the work per input
+    position is bounded by the longest keyword rather than the number of keywords.
+    Every occurrence is reported, including overlapping ones and keywords that are
+    prefixes of other keywords.
+    """
+    def __init__(self, entries: Iterable[Tuple[str, Tuple, bool]]):
+        labels = defaultdict(list)
+        for keyword, label, bounded in entries:
+            if keyword:
+                labels[keyword].append((label, bounded))
+        self.labels = MappingProxyType({keyword: tuple(found) for keyword, found in labels.items()})
+        self.bounded = any(bounded for found in self.labels.values() for _, bounded in found)
+
+        trie = {}
+        for keyword in self.labels:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[""] = keyword
+
+        # Keywords that are prefixes of each keyword (itself included); the regex
+        # reports the longest keyword at a position and these fill in the rest.
+        prefixes = {}
+        for keyword in self.labels:
+            node, found = trie, []
+            for ch in keyword:
+                node = node[ch]
+                if "" in node:
+                    found.append(node[""])
+            prefixes[keyword] = tuple(found)
+        self.prefixes = MappingProxyType(prefixes)
+
+        self.pattern = re.compile("(?=(" + _trie_pattern(trie) + "))", re.DOTALL) if trie else None
+
+    def scan(self, text: str) -> List[KeywordHit]:
+        hits = []
+        if self.pattern is None:
+            return hits
+        for m in self.pattern.finditer(text):
+            start = m.start()
+            for keyword in self.prefixes[m.group(1)]:
+                end = start + len(keyword)
+                for label, bounded in self.labels[keyword]:
+                    if not bounded or _at_word_boundaries(text, start, end):
+                        hits.append(KeywordHit(start, end, keyword, label))
+        return hits
+
+    def labels_in(self, text: str) -> set:
+        """Distinct labels found in text; cheaper than scan() when positions are not needed."""
+        if self.pattern is None:
+            return set()
+        if self.bounded:
+            return {hit.label for hit in self.scan(text)}
+        if len(self.labels) <= DIRECT_SCAN_MAX_KEYWORDS:
+            # A few C-level substring searches beat one regex pass over every position.
+            present = [keyword for keyword in self.labels if keyword in text]
+        else:
+            present = {k for m in self.pattern.finditer(text) for k in self.prefixes[m.group(1)]}
+        return {label for keyword in present for label, _ in self.labels[keyword]}
+
+def _heuristic_entries(razor_data: Dict, fallacy_data: Dict):
+    for category, rules in (("razor", razor_data.get("razors", [])), ("trap", fallacy_data.get("traps", []))):
+        for order, rule in enumerate(rules):
+            for keyword in rule.get("keywords", []):
+                yield normalize_text(keyword), (category, order, rule.get("name", "Unknown")), True
+
+def _rhetoric_entries(bundle: Dict):
+    for order, tag_rule in enumerate(bundle.get("tags", [])):
+        for keyword in tag_rule.get("keywords", []):
+            yield keyword, ("tag", order, tag_rule["name"]), False
+    for order, (mode, data) in enumerate(bundle.get("classification", {}).items()):
+        for keyword in data.get("keywords", []):
+            yield keyword, ("classification", order, mode), False
+    for order, key in enumerate(bundle.get("anchors", {})):
+        yield key, ("anchor", order, key), False
+    order = 0
+    for _, devices in bundle.get("style_devices", {}).items():
+        for device in devices:
+            yield device, ("style_device", order, device), False
+            order += 1
+    for order, (cue_type, words) in enumerate(bundle.get("advanced_cues", {}).items()):
+        for word in words:
+            yield word, ("advanced_cue", order, cue_type), False
+    for name, (keywords, bounded) in CLAIM_CUES.items():
+        for keyword in keywords:
+            yield keyword, ("cue", 0, name), bounded
+
+class MatchReport(NamedTuple):
+    rhetoric: List[KeywordHit]    # offsets into text.lower()
+    heuristics: List[KeywordHit]  # offsets into normalize_text(text)
+
+    def by_category(self) -> Dict[str, List[Dict]]:
+        grouped = defaultdict(list)
+        for hit in self.rhetoric + self.heuristics:
+            category, _, name = hit.label
+            grouped[category].append({"name": name, "keyword": hit.keyword, "start": hit.start, "end": hit.end})
+        return dict(grouped)
+
+class RuleMatcher:
+    """
+    One compiled matcher for every razor, trap, rhetoric tag, anchor and cue.
+
+    Razors and traps match whole words of normalize_text(text), as before; rhetoric
+    rules keep their substring semantics over text.lower().
+    """
+    def __init__(self, razor_data: Optional[Dict] = None, fallacy_data: Optional[Dict] = None,
+                 rhetoric_rules_bundle: Optional[Dict] = None):
+        self.heuristics = KeywordMatcher(_heuristic_entries(razor_data or {}, fallacy_data or {}))
+        self.rhetoric = KeywordMatcher(_rhetoric_entries(rhetoric_rules_bundle or {}))
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "RuleMatcher":
+        return cls(config["razors"], config["fallacies"], config["rhetoric_rules"])
+
+    def scan(self, text: Text) -> MatchReport:
+        text = tokenize(text)
+        return MatchReport(self.rhetoric.scan(text.lower), self.heuristics.scan(text.normalized))
+
+def matched_labels(hits: Iterable[KeywordHit], category: str) -> List[Tuple]:
+    """Distinct labels of one category, in config order."""
+    return sorted({hit.label for hit in hits if hit.label[0] == category})
+
+def labels_by_category(hits: Iterable[KeywordHit]) -> Dict[str, List[Tuple]]:
+    """matched_labels for every category at once, in one pass over the hits."""
+    grouped = defaultdict(set)
+    for hit in hits:
+        grouped[hit.label[0]].add(hit.label)
+    return defaultdict(list, {category: sorted(labels) for category, labels in grouped.items()})
+
+# A claim's KeywordHits, or those hits already grouped by labels_by_category.
+ClaimHits = Union[List[KeywordHit], Dict[str, List[Tuple]]]
+
+def bucket_hits(hits: List[KeywordHit], spans: List[Tuple[int, int]]) -> List[List[KeywordHit]]:
+    """Assign each hit to the span that fully contains it."""
+    buckets = [[] for _ in spans]
+    ordered = sorted(hits, key=lambda h: h.start)
+    i = 0
+    for idx, (start, end) in enumerate(spans):
+        while i < len(ordered) and ordered[i].start < start:
+            i += 1
+        j = i
+        while j < len(ordered) and ordered[j].start < end:
+            if ordered[j].end <= end:
+                buckets[idx].append(ordered[j])
+            j += 1
+        i = j
+    return buckets
 
 # ===================================
-# Load Config from JSON
+# Check Matrix Scoring
 # ===================================
-def load_config():
-    base_path = os.path.dirname(__file__)  # Adjust if running elsewhere
-    with open(os.path.join(base_path, "All_Logic_Rules.json"), "r") as f:
-        logic_and_rhetoric = json.load(f)
-    with open(os.path.join(base_path, "RazorsAndTraps.json"), "r") as f:
-        heuristics = json.load(f)
-
-    config = {
-        "logic_rules": logic_and_rhetoric.get("logic_rules", {}),
-        "rhetoric_rules": logic_and_rhetoric.get("rhetoric_rules", {}),
-        "rhetoric_rules_expanded": logic_and_rhetoric.get("rhetoric_rules_expanded", {}),
-        "macro_logic_checks": logic_and_rhetoric.get("macro_logic_checks", {}),
-        "razors": heuristics.get("Philosophical_Razors", {}),
-        "fallacies": heuristics.get("Mind_Traps", {})
-    }
-    return config
+# The logical checks, in the order claims report them: (name, passes(has)), where
+# has(cue) tells whether the claim contains that CLAIM_CUES cue. The only definition
+# of the checks; everything below works on rows of their outcomes.
+_LOGICAL_CHECK_RULES = (
+    ("Subject-Verb Integrity", lambda has: has("verb")),
+    ("Law of Non-Contradiction", lambda has: not has("contradiction")),
+    ("Conditional Inference", lambda has: has("if") and has("then")),
+    ("Quantifier Detected", lambda has: has("quantifier")),
+    ("Modal Detected", lambda has: has("modal")),
+)
+LOGICAL_CHECKS = tuple(name for name, _ in _LOGICAL_CHECK_RULES)
+_CHECK_CUES = ("verb", "contradiction", "if", "then", "quantifier", "modal")
+_CUE_BIT = {name: 1 << column for column, name in enumerate(_CHECK_CUES)}
+
+def _checks_for(cues: int) -> Tuple[bool, ...]:
+    """LOGICAL_CHECKS outcomes for a claim whose _CHECK_CUES are the set bits of `cues`."""
+    return tuple(bool(passes(lambda name: cues & _CUE_BIT[name])) for _, passes in _LOGICAL_CHECK_RULES)
+
+def _cue_bits(cue_names: Iterable[str]) -> int:
+    return sum({_CUE_BIT[name] for name in cue_names if name in _CUE_BIT})
+
+# Every combination of cues, so the pure-Python path is one lookup per claim.
+_CHECKS_BY_CUES = tuple(_checks_for(cues) for cues in range(1 << len(_CHECK_CUES)))
+_PASSED_BY_CUES = tuple(sum(checks) for checks in _CHECKS_BY_CUES)
+# A row of outcomes -> (passed, failed) check names, for the per-claim dicts.
+_RULES_BY_CHECKS = {
+    checks: (tuple(name for name, ok in zip(LOGICAL_CHECKS, checks) if ok),
+             tuple(name for name, ok in zip(LOGICAL_CHECKS, checks) if not ok))
+    for checks in set(_CHECKS_BY_CUES)
+}
+
+# numpy is optional and imported on first use: below this many claims building
+# arrays costs more than it saves, so short inputs never import it.
+VECTORIZE_MIN_CLAIMS = int(os.getenv("ROWAN_VECTORIZE_MIN_CLAIMS", "256"))
+_numpy = None
+
+def _load_numpy():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+class CheckMatrix(NamedTuple):
+    """claims × LOGICAL_CHECKS outcomes: a bool ndarray when numpy was used, else a list of row tuples."""
+    rows: object
+    claims: int
+    passed: int
+
+def check_matrix(hits: Iterable[KeywordHit], spans: List[Tuple[int, int]]) -> CheckMatrix:
+    """
+    Logical-check outcomes of every claim from one pass over a text's rhetoric
+    hits, each assigned to the span that fully contains it, as bucket_hits does.
+    """
+    cue_hits = [(hit.start, hit.end, _CUE_BIT[hit.label[2]]) for hit in hits
+                if hit.label[0] == "cue" and hit.label[2] in _CUE_BIT]
+    np = _load_numpy() if len(spans) >= VECTORIZE_MIN_CLAIMS else None
+    if np is not None:
+        bounds = np.fromiter(chain.from_iterable(spans), dtype=np.int64, count=2 * len(spans)).reshape(-1, 2)
+        found = np.fromiter(chain.from_iterable(cue_hits), dtype=np.int64, count=3 * len(cue_hits)).reshape(-1, 3)
+        claim = np.searchsorted(bounds[:, 0], found[:, 0], side="right") - 1
+        end = bounds[claim.clip(0), 1]
+        inside = (claim >= 0) & (found[:, 0] < end) & (found[:, 1] <= end)
+        cues = np.zeros(len(spans), dtype=np.int64)
+        np.bitwise_or.at(cues, claim[inside], found[inside, 2])
+        rows = np.array(_CHECKS_BY_CUES, dtype=bool)[cues]
+        return CheckMatrix(rows, len(spans), int(rows.sum()))
+
+    starts = [start for start, _ in spans]
+    cues = [0] * len(spans)
+    for start, end, bit in cue_hits:
+        claim = bisect_right(starts, start) - 1
+        if claim >= 0 and start < spans[claim][1] and end <= spans[claim][1]:
+            cues[claim] |= bit
+    return CheckMatrix([_CHECKS_BY_CUES[c] for c in cues], len(spans), sum(_PASSED_BY_CUES[c] for c in cues))
+
+def bucketed_check_matrix(per_claim_hits: List[List[KeywordHit]]) -> CheckMatrix:
+    """check_matrix for hits already split per claim by bucket_hits; rows are always tuples."""
+    cues = [_cue_bits(hit.label[2] for hit in hits if hit.label[0] == "cue") for hits in per_claim_hits]
+    return CheckMatrix([_CHECKS_BY_CUES[c] for c in cues], len(cues), sum(_PASSED_BY_CUES[c] for c in cues))
 
 # ===================================
 # REAL Engine (Logic + Rhetoric Analysis)
 # ===================================
 class REAL_Engine:
-    def __init__(self, logic_rules: Dict, rhetoric_rules_bundle: Dict):
+    def __init__(self, logic_rules: Dict, rhetoric_rules_bundle: Dict, matcher: Optional[RuleMatcher] = None):
         self.logic_rules = logic_rules
         self.rhetoric_tags_list = rhetoric_rules_bundle.get("tags", [])
         self.classification = rhetoric_rules_bundle.get("classification", {})
         self.anchors = rhetoric_rules_bundle.get("anchors", {})
         self.style_devices = rhetoric_rules_bundle.get("style_devices", {})
         self.advanced_cues = rhetoric_rules_bundle.get("advanced_cues", {})
-
-    def classify_mode_and_purpose(self, claim: str):
-        for mode, data in self.classification.items():
-            if any(k in claim.lower() for k in data.get("keywords", [])):
-                return mode, data.get("purpose")
+        self.matcher = matcher or RuleMatcher(rhetoric_rules_bundle=rhetoric_rules_bundle)
+
+    def scan_claim(self, claim: str) -> List[KeywordHit]:
+        return self.matcher.rhetoric.scan(claim.lower())
+
+    def claim_labels(self, claim: str, hits: Optional[ClaimHits] = None) -> Dict[str, List[Tuple]]:
+        """
+        Matched labels of a claim grouped by category. `hits` may be the claim's
+        KeywordHits or an already grouped result, which is passed through, so
+        evaluate_claim groups once and shares it with every helper.
+        """
+        if isinstance(hits, dict):
+            return hits
+        return labels_by_category(self.scan_claim(claim) if hits is None else hits)
+
+    def classify_mode_and_purpose(self, claim: str, hits: Optional[ClaimHits] = None):
+        found = self.claim_labels(claim, hits)["classification"]
+        if found:
+            mode = found[0][2]
+            return mode, self.classification[mode].get("purpose")
         return None, None
 
-    def resolve_anchor(self, claim: str):
-        for key, val in self.anchors.items():
-            if key in claim.lower():
-                return val
-        return None
-
-    def detect_style_devices(self, claim: str):
-        found = []
-        for _, devices in self.style_devices.items():
-            for device in devices:
-                if device in claim.lower():
-                    found.append(device)
-        return found
-
-    def detect_advanced_cues(self, claim: str):
-        cues_found = []
-        for cue_type, words in self.advanced_cues.items():
-            if any(word in claim.lower() for word in words):
-                cues_found.append(cue_type)
-        return cues_found
-
-    def expand_interpretations(self, claim: str):
+    def resolve_anchor(self, claim: str, hits: Optional[ClaimHits] = None):
+        found = self.claim_labels(claim, hits)["anchor"]
+        return self.anchors[found[0][2]] if found else None
+
+    def detect_style_devices(self, claim: str, hits: Optional[ClaimHits] = None):
+        return [device for _, _, device in self.claim_labels(claim, hits)["style_device"]]
+
+    def detect_advanced_cues(self, claim: str, hits: Optional[ClaimHits] = None):
+        return [cue_type for _, _, cue_type in self.claim_labels(claim, hits)["advanced_cue"]]
+
+    def expand_interpretations(self, claim: str, hits: Optional[ClaimHits] = None):
+        labels = self.claim_labels(claim, hits)
         interpretations = []
-        mode, purpose = self.classify_mode_and_purpose(claim)
-        anchor = self.resolve_anchor(claim)
-        style_found = self.detect_style_devices(claim)
+        mode, purpose = self.classify_mode_and_purpose(claim, labels)
+        anchor = self.resolve_anchor(claim, labels)
+        style_found = self.detect_style_devices(claim, labels)
 
         interpretations.append({
             "meaning": claim.strip(),
@@ -97,45 +371,25 @@ class REAL_Engine:
 
         return interpretations
 
-    def evaluate_claim(self, claim: str) -> Dict:
-        passed, failed = [], []
-
-        if re.search(r'\b(is|are|was|were|has|have|do|does|cannot|must)\b', claim.lower()):
-            passed.append("Subject-Verb Integrity")
-        else:
-            failed.append("Subject-Verb Integrity")
+    def evaluate_claim(self, claim: str, hits: Optional[ClaimHits] = None, checks=None) -> Dict:
+        """
+        The full analysis of one claim. `checks` is the claim's row tuple of the
+        check matrix; without it the row is looked up from the claim's cues.
+        """
+        labels = self.claim_labels(claim, hits)
+        cues = {name for _, _, name in labels["cue"]}
+        if checks is None:
+            checks = _CHECKS_BY_CUES[_cue_bits(cues)]
+        passed, failed = _RULES_BY_CHECKS[checks]
 
-        if " and not " in claim.lower():
-            failed.append("Law of Non-Contradiction")
-        else:
-            passed.append("Law of Non-Contradiction")
+        interpretations = self.expand_interpretations(claim, labels)
 
-        if "if" in claim.lower() and "then" in claim.lower():
-            passed.append("Conditional Inference")
-        else:
-            failed.append("Conditional Inference")
+        rhetoric_tags = [name for _, _, name in labels["tag"]]
 
-        if any(q in claim.lower() for q in ["all", "none", "everybody", "nobody"]):
-            passed.append("Quantifier Detected")
-        else:
-            failed.append("Quantifier Detected")
-
-        if any(m in claim.lower() for m in ["must", "should", "necessary", "possible"]):
-            passed.append("Modal Detected")
-        else:
-            failed.append("Modal Detected")
-
-        interpretations = self.expand_interpretations(claim)
-
-        rhetoric_tags = []
-        for tag_rule in self.rhetoric_tags_list:
-            if any(keyword in claim.lower() for keyword in tag_rule.get("keywords", [])):
-                rhetoric_tags.append(tag_rule["name"])
-
-        advanced_cues_found = self.detect_advanced_cues(claim)
-        style_tags = self.detect_style_devices(claim)
-        anchor_detected = self.resolve_anchor(claim)
-        purpose = self.estimate_rhetorical_purpose(claim)
+        advanced_cues_found = self.detect_advanced_cues(claim, labels)
+        style_tags = self.detect_style_devices(claim, labels)
+        anchor_detected = self.resolve_anchor(claim, labels)
+        purpose = self.estimate_rhetorical_purpose(claim, labels)
 
         primary_mode = "logos"
         secondary_modes = []
@@ -145,14 +399,14 @@ class REAL_Engine:
             secondary_modes.append("pathos")
 
         integrity_flags = []
-        if re.search(r"\b(clearly|obviously|undeniably|it is evident|it is clear)\b", claim.lower()):
+        if "assumed_agreement" in cues:
             integrity_flags.append("Assumed Agreement")
-        if re.search(r"\b(likely|may|could|possibly|expected)\b", claim.lower()):
+        if "speculative" in cues:
             integrity_flags.append("Speculative Assertion")
 
         return {
             "core_statement": claim.strip(),
-            "logical_checks": {"passed_rules": passed, "failed_rules": failed},
+            "logical_checks": {"passed_rules": list(passed), "failed_rules": list(failed)},
             "rhetorical_strategy": {
                 "primary_mode": primary_mode,
                 "secondary_modes": secondary_modes,
@@ -166,94 +420,202 @@ class REAL_Engine:
             "semantic_flags": integrity_flags
         }
 
-    def estimate_rhetorical_purpose(self, claim: str) -> str:
-        if "thank" in claim.lower() or "grateful" in claim.lower():
+    def estimate_rhetorical_purpose(self, claim: str, hits: Optional[ClaimHits] = None) -> str:
+        labels = self.claim_labels(claim, hits)
+        cues = {name for _, _, name in labels["cue"]}
+        if "gratitude" in cues:
             return "express gratitude"
-        if "justice" in claim.lower() or "freedom" in claim.lower():
+        if "moral_principle" in cues:
             return "invoke moral principle"
         return "inform"
 
-    def process(self, text: str) -> Dict:
-        claims = segment_text(text)
-        detailed_claims = [self.evaluate_claim(c) for c in claims]
-
-        total_checks = sum(len(c["logical_checks"]["passed_rules"]) + len(c["logical_checks"]["failed_rules"]) for c in detailed_claims)
-        passed_checks = sum(len(c["logical_checks"]["passed_rules"]) for c in detailed_claims)
+    def process(self, text: Text, report: Optional[MatchReport] = None,
+                spans: Optional[List[Tuple[int, int]]] = None, claims: bool = True) -> Dict:
+        """
+        Score every sentence of text from the check matrix. With claims=True
+        each claim's dict is built too, its logical checks read from its matrix
+        row; with claims=False the result carries claim_count and passed_checks
+        instead of claims_analysis.
+        """
+        tokenized = tokenize(text)
+        text = tokenized.text
+        spans = tokenized.sentence_spans if spans is None else spans
+        if len(tokenized.lower) == len(text):
+            # One scan of the whole text; hits are handed to the sentence containing them.
+            if report is None:
+                report = self.matcher.scan(tokenized)
+            if not claims:
+                matrix = check_matrix(report.rhetoric, spans)
+                return self.score_totals(matrix.claims, matrix.passed)
+            per_claim_hits = bucket_hits(report.rhetoric, spans)
+            rows = bucketed_check_matrix(per_claim_hits).rows
+        else:
+            # Lowercasing changed the length, so offsets no longer line up with the spans;
+            # each claim is scanned, and its checks looked up, on its own.
+            per_claim_hits = rows = [None] * len(spans)
+        detailed_claims = [self.evaluate_claim(text[start:end], hits, checks)
+                           for (start, end), hits, checks in zip(spans, per_claim_hits, rows)]
+        scored = self.score_claims(detailed_claims)
+        return scored if claims else self.score_totals(*self.check_totals(scored))
+
+    @staticmethod
+    def _score(passed_checks: int, total_checks: int) -> Tuple[float, str]:
         base_logic_score = round(passed_checks / total_checks, 3) if total_checks else 0.0
-
         logic_score = min(max(base_logic_score, 0), 1)
         status = "sound" if logic_score >= 0.96 else "uncertain" if logic_score >= 0.71 else "fail"
+        return logic_score, status
 
+    @staticmethod
+    def score_claims(detailed_claims: List[Dict]) -> Dict:
+        """Score evaluated claims; claims are independent, so lists from separate chunks can be concatenated."""
+        total_checks = sum(len(c["logical_checks"]["passed_rules"]) + len(c["logical_checks"]["failed_rules"]) for c in detailed_claims)
+        passed_checks = sum(len(c["logical_checks"]["passed_rules"]) for c in detailed_claims)
+        logic_score, status = REAL_Engine._score(passed_checks, total_checks)
         return {"claims_analysis": detailed_claims, "logic_score": logic_score, "status": status}
 
+    @staticmethod
+    def score_totals(claim_count: int, passed_checks: int) -> Dict:
+        """score_claims for claims known only by their check totals (process(claims=False))."""
+        logic_score, status = REAL_Engine._score(passed_checks, claim_count * len(LOGICAL_CHECKS))
+        return {"claims_analysis": None, "claim_count": claim_count, "passed_checks": passed_checks,
+                "logic_score": logic_score, "status": status}
+
+    @staticmethod
+    def check_totals(logic_result: Dict) -> Tuple[int, int]:
+        """(claim_count, passed_checks) of a process() result, with or without its claims."""
+        claims = logic_result["claims_analysis"]
+        if claims is None:
+            return logic_result["claim_count"], logic_result["passed_checks"]
+        return len(claims), sum(len(c["logical_checks"]["passed_rules"]) for c in claims)
+
 # ===================================
 # Razor and Fallacy Analysis
 # ===================================
 class RazorAnalysis:
-    def __init__(self, razor_data: Dict):
+    def __init__(self, razor_data: Dict, matcher: Optional[RuleMatcher] = None):
         self.razors = razor_data.get("razors", [])
+        self.matcher = matcher or RuleMatcher(razor_data=razor_data)
 
-    def analyze(self, text: str) -> Dict:
-        normalized_text = normalize_text(text)
+    def analyze(self, text: Text, report: Optional[MatchReport] = None) -> Dict:
+        hits = report.heuristics if report else self.matcher.heuristics.scan(tokenize(text).normalized)
         matched = []
-        for razor in self.razors:
-            keywords = [normalize_text(k) for k in razor.get("keywords", [])]
-            if any(re.search(rf'\b{re.escape(k)}\b', normalized_text) for k in keywords):
-                matched.append({
-                    "razor": razor.get("name", "Unknown"),
-                    "description": razor.get("description", ""),
-                    "weight": razor.get("weight", 0.01)
-                })
+        for _, order, _ in matched_labels(hits, "razor"):
+            razor = self.razors[order]
+            matched.append({
+                "razor": razor.get("name", "Unknown"),
+                "description": razor.get("description", ""),
+                "weight": razor.get("weight", 0.01)
+            })
         return {"matched_razors": matched}
 
 class FallacyAnalysis:
-    def __init__(self, fallacy_data: Dict):
+    def __init__(self, fallacy_data: Dict, matcher: Optional[RuleMatcher] = None):
         self.fallacies = fallacy_data.get("traps", [])
+        self.matcher = matcher or RuleMatcher(fallacy_data=fallacy_data)
 
-    def analyze(self, text: str) -> Dict:
-        normalized_text = normalize_text(text)
+    def analyze(self, text: Text, report: Optional[MatchReport] = None) -> Dict:
+        hits = report.heuristics if report else self.matcher.heuristics.scan(tokenize(text).normalized)
         detected = []
-        for fallacy in self.fallacies:
-            keywords = [normalize_text(k) for k in fallacy.get("keywords", [])]
-            if any(re.search(rf'\b{re.escape(k)}\b', normalized_text) for k in keywords):
-                detected.append({
-                    "fallacy": fallacy.get("name", "Unknown"),
-                    "description": fallacy.get("description", ""),
-                    "priority": fallacy.get("priority", 0)
-                })
+        for _, order, _ in matched_labels(hits, "trap"):
+            fallacy = self.fallacies[order]
+            detected.append({
+                "fallacy": fallacy.get("name", "Unknown"),
+                "description": fallacy.get("description", ""),
+                "priority": fallacy.get("priority", 0)
+            })
         return {"detected_fallacies": detected}
 
 # ===================================
 # Evaluate Full Argument
 # ===================================
-def evaluate_argument(text: str, config: Dict) -> Dict:
-    real_engine = REAL_Engine(config["logic_rules"], config["rhetoric_rules"])
-    logic_result = real_engine.process(text)
-
-    razor_analyzer = RazorAnalysis(config["razors"])
-    razor_result = razor_analyzer.analyze(text)
-
-    fallacy_analyzer = FallacyAnalysis(config["fallacies"])
-    fallacy_result = fallacy_analyzer.analyze(text)
-
-    combined_result = {
-        "logic": logic_result,
-        "razors": razor_result["matched_razors"],
-        "fallacies": fallacy_result["detected_fallacies"],
-        "meta": {
-            "applied_razors": [r["razor"] for r in razor_result["matched_razors"]],
-            "applied_traps": [f["fallacy"] for f in fallacy_result["detected_fallacies"]]
+class ArgumentAnalyzer:
+    """
+    Long-lived evaluator built once from a config.
+
+    The keyword tables and engines are compiled up front and never mutated
+    afterwards, so one instance can serve concurrent requests.
+    """
+    def __init__(self, config: Dict):
+        self.matcher = RuleMatcher.from_config(config)
+        self.real_engine = REAL_Engine(config["logic_rules"], config["rhetoric_rules"], self.matcher)
+        self.razor_analyzer = RazorAnalysis(config["razors"], self.matcher)
+        self.fallacy_analyzer = FallacyAnalysis(config["fallacies"], self.matcher)
+        self.razor_order = [r.get("name", "Unknown") for r in self.razor_analyzer.razors]
+        self.trap_order = [f.get("name", "Unknown") for f in self.fallacy_analyzer.fallacies]
+        self.trap_weights = {f.get("name", "Unknown"): f.get("weight", 0) for f in self.fallacy_analyzer.fallacies}
+
+    def analyze(self, text: Text, spans: Optional[List[Tuple[int, int]]] = None, claims: bool = True) -> Dict:
+        """claims=False leaves out the per-claim detail (see REAL_Engine.process)."""
+        text = tokenize(text)
+        report = self.matcher.scan(text)
+        logic_result = self.real_engine.process(text, report, spans, claims)
+        razor_result = self.razor_analyzer.analyze(text, report)
+        fallacy_result = self.fallacy_analyzer.analyze(text, report)
+
+        return self.combine(logic_result, razor_result["matched_razors"], fallacy_result["detected_fallacies"])
+
+    def combine(self, logic_result: Dict, razors: List[Dict], fallacies: List[Dict]) -> Dict:
+        # Razor weights are positive and trap weights negative in RazorsAndTraps.json.
+        razor_bonus = round(sum(r["weight"] for r in razors), 3)
+        fallacy_penalty = round(sum(self.trap_weights.get(f["fallacy"], 0) for f in fallacies), 3)
+        adjusted_score = round(min(max(logic_result["logic_score"] + razor_bonus + fallacy_penalty, 0), 1), 3)
+        status = "sound" if adjusted_score >= 0.96 else "uncertain" if adjusted_score >= 0.71 else "fail"
+
+        combined_result = {
+            "logic": logic_result,
+            "razors": razors,
+            "fallacies": fallacies,
+            "meta": {
+                "applied_razors": [r["razor"] for r in razors],
+                "applied_traps": [f["fallacy"] for f in fallacies]
+            },
+            "adjusted_score": adjusted_score,
+            "status": status,
+            "modifiers": {"razor_bonus": razor_bonus, "fallacy_penalty": fallacy_penalty},
+            "explanations": [f"{r['razor']}: {r['description']}" for r in razors] +
+                            [f"{f['fallacy']}: {f['description']}" for f in fallacies]
         }
-    }
-    return combined_result
+        return combined_result
+
+    def merge(self, results: List[Dict]) -> Dict:
+        """
+        Fold analyze() results for consecutive chunks of one text into one result.
+
+        Claims are concatenated and rescored, or their check totals summed when
+        the chunks were analysed without claims; razors and traps are the union
+        of what each chunk matched, in config order, so each one counts once.
+        """
+        parts = [result["logic"] for result in results]
+        if all(part["claims_analysis"] is not None for part in parts):
+            logic = REAL_Engine.score_claims([claim for part in parts for claim in part["claims_analysis"]])
+        else:
+            totals = [REAL_Engine.check_totals(part) for part in parts]
+            logic = REAL_Engine.score_totals(sum(n for n, _ in totals), sum(p for _, p in totals))
+        razors = {r["razor"]: r for result in results for r in result["razors"]}
+        fallacies = {f["fallacy"]: f for result in results for f in result["fallacies"]}
+        return self.combine(
+            logic,
+            [razors[name] for name in self.razor_order if name in razors],
+            [fallacies[name] for name in self.trap_order if name in fallacies]
+        )
+
+registry.register_compiler("argument_analyzer", lambda snapshot: ArgumentAnalyzer(snapshot.logic_config))
+
+def shared_analyzer() -> ArgumentAnalyzer:
+    """The analyzer compiled for the current config snapshot."""
+    return current_snapshot().compiled("argument_analyzer")
+
+def evaluate_argument(text: Text, config: Optional[Dict] = None) -> Dict:
+    if config is None:
+        return shared_analyzer().analyze(text)
+    return ArgumentAnalyzer(config).analyze(text)
 
 # ===================================
 # Example Usage
 # ===================================
 if __name__ == "__main__":
-    config = load_config()
     text = "If justice fails, then society collapses. We all know this clearly."
-    result = evaluate_argument(text, config)
+    result = evaluate_argument(text)
 
     print("Logic Score:", result["logic"]["logic_score"])
     print("Applied Razors:", result["meta"]["applied_razors"])
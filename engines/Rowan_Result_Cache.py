@@ -0,0 +1,133 @@
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+RESULT_CACHE_SIZE = int(os.getenv("ROWAN_RESULT_CACHE_SIZE", "1024"))
+
+
+def normalize_input(text: str) -> str:
+    """Collapse whitespace so re-wrapped or re-indented text maps to the same key."""
+    return " ".join(text.split())
+
+
+def result_cache_key(normalized_input: str, mode, config_version: str, statute: str = "") -> str:
+    """
+    `statute` names the statute section and index version the input was read
+    against, if any; it is left out otherwise, so keys (which also seed the
+    persona layer) for plain inputs are unchanged.
+    """
+    digest = hashlib.sha256()
+    parts = (config_version, mode or "auto", normalized_input)
+    for part in parts + (statute,) if statute else parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Size-bounded LRU of pipeline results keyed by content hash.
+
+    Entries are copied in and out, so callers may mutate what they get back.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries,
+                    "hits": self.hits, "misses": self.misses}
+
+
+class _InFlightCall:
+    __slots__ = ("done", "waiters", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one computation.
+
+    The first caller for a key computes; callers arriving while it runs wait
+    for it and get their own copy of its result (or its exception) instead of
+    computing again. Once the call finishes the key is free, so a later call
+    computes afresh (normally it is then served from the result cache).
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def run(self, key, fn: Callable):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _InFlightCall()
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            # No one can join once the key is removed, so `waiters` is final here.
+            if call.waiters and call.error is None:
+                # The leader's caller may mutate its result, so waiters copy from a private one.
+                call.result = copy.deepcopy(result)
+            call.done.set()
+        return result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,215 @@
+import fcntl
+import json
+import os
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# ----------------------
+# CONFIG
+# ----------------------
+SESSION_STORE_URL = os.getenv("ROWAN_SESSION_STORE", "memory")
+SESSION_TTL_SECONDS = float(os.getenv("ROWAN_SESSION_TTL_SECONDS", "1800"))
+SESSION_MAX_ENTRIES = int(os.getenv("ROWAN_SESSION_MAX_ENTRIES", "10000"))
+SESSION_MAX_BYTES = int(os.getenv("ROWAN_SESSION_MAX_BYTES", str(16 * 1024 * 1024)))
+MAX_QUERY_CHARS = 4000   # clarification rounds append to last_query; keep only the tail
+LOCK_STRIPES = 64
+
+
+def new_session():
+    return {"attempts": 0}
+
+
+def _cap_query(context):
+    query = context.get("last_query")
+    if query and len(query) > MAX_QUERY_CHARS:
+        context["last_query"] = query[-MAX_QUERY_CHARS:]
+    return context
+
+
+def _stripe(session_id):
+    # Stable across processes, unlike hash().
+    return zlib.crc32(session_id.encode("utf-8")) % LOCK_STRIPES
+
+# ----------------------
+# INTERFACE
+# ----------------------
+class SessionStore(ABC):
+    """
+    Clarification state per session id.
+
+    `session(session_id)` is the only way callers should touch state: it holds
+    that session's lock, yields a mutable dict, and saves it on exit, so
+    concurrent requests for one session cannot lose each other's updates.
+    """
+
+    @abstractmethod
+    def get(self, session_id):
+        """The session's context, or a new_session() if it is unknown or expired."""
+
+    @abstractmethod
+    def put(self, session_id, context):
+        """Save the session's context."""
+
+    @abstractmethod
+    def delete(self, session_id):
+        """Forget the session."""
+
+    @abstractmethod
+    def lock(self, session_id):
+        """A context manager that holds this session's lock."""
+
+    @contextmanager
+    def session(self, session_id):
+        with self.lock(session_id):
+            context = self.get(session_id)
+            yield context
+            self.put(session_id, context)
+
+# ----------------------
+# IN-MEMORY LRU + TTL
+# ----------------------
+class MemorySessionStore(SessionStore):
+    """Per-process store bounded by entry count, approximate bytes and idle TTL."""
+
+    def __init__(self, ttl=SESSION_TTL_SECONDS, max_entries=SESSION_MAX_ENTRIES, max_bytes=SESSION_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # session_id -> (context, expires_at, size)
+        self._bytes = 0
+        self._mutex = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _drop(self, session_id):
+        _, _, size = self._entries.pop(session_id)
+        self._bytes -= size
+
+    def get(self, session_id):
+        with self._mutex:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return new_session()
+            if entry[1] < time.monotonic():
+                self._drop(session_id)
+                return new_session()
+            return dict(entry[0])
+
+    def put(self, session_id, context):
+        # Re-inserting moves the session to the young end, so insertion order is
+        # both LRU order and expiry order.
+        context = _cap_query(dict(context))
+        size = len(session_id) + len(json.dumps(context))
+        with self._mutex:
+            if session_id in self._entries:
+                self._drop(session_id)
+            self._entries[session_id] = (context, time.monotonic() + self.ttl, size)
+            self._bytes += size
+            now = time.monotonic()
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+                                     or next(iter(self._entries.values()))[1] < now):
+                self._drop(next(iter(self._entries)))
+
+    def delete(self, session_id):
+        with self._mutex:
+            if session_id in self._entries:
+                self._drop(session_id)
+
+    @contextmanager
+    def lock(self, session_id):
+        with self._stripes[_stripe(session_id)]:
+            yield
+
+# ----------------------
+# SQLITE (SHARED ACROSS WORKERS)
+# ----------------------
+class SQLiteSessionStore(SessionStore):
+    """
+    Store backed by one SQLite file that several worker processes can open.
+
+    Session locks are striped flock() locks on files next to the database, so
+    they hold across processes as well as threads. Expired rows are purged
+    periodically on write.
+    """
+
+    PURGE_EVERY = 500
+
+    def __init__(self, path, ttl=SESSION_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self.lock_dir = path + ".locks"
+        os.makedirs(self.lock_dir, exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        # The store is created at import, which may be in a server parent that
+        # forks workers afterwards; the schema connection is closed again so no
+        # connection is inherited across the fork.
+        conn = self._open()
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS sessions ("
+                    "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS sessions_expiry ON sessions (expires_at)")
+        finally:
+            conn.close()
+
+    def _open(self):
+        import sqlite3  # only deployments using this store pay for the import
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _connection(self):
+        # sqlite3 connections are per thread and opened on first use, so each
+        # forked worker opens its own.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = self._open()
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, session_id):
+        row = self._connection().execute(
+            "SELECT data FROM sessions WHERE session_id = ? AND expires_at >= ?", (session_id, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else new_session()
+
+    def put(self, session_id, context):
+        data = json.dumps(_cap_query(dict(context)))
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, data, expires_at) VALUES (?, ?, ?)",
+                (session_id, data, time.time() + self.ttl)
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                conn.execute("DELETE FROM sessions WHERE expires_at < ?", (time.time(),))
+
+    def delete(self, session_id):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    @contextmanager
+    def lock(self, session_id):
+        # A fresh descriptor per acquisition, so threads of one process exclude each other too.
+        with open(os.path.join(self.lock_dir, f"{_stripe(session_id)}.lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def create_session_store(url=SESSION_STORE_URL):
+    """'memory' or 'sqlite:///path/to/sessions.db'."""
+    if url.startswith("sqlite:///"):
+        return SQLiteSessionStore(url[len("sqlite:///"):])
+    return MemorySessionStore()
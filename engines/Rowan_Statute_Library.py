@@ -0,0 +1,246 @@
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from engines.Rowan_Config_Registry import current_snapshot
+from engines.Rowan_Tokenizer import TokenizedText
+from orchestrator.serialization import dumps, loads
+
+# ----------------------
+# CONFIG
+# ----------------------
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATUTE_DIR = os.getenv("ROWAN_STATUTE_DIR", os.path.join(_ROOT, "statutes"))
+STATUTE_INDEX = os.getenv("ROWAN_STATUTE_INDEX", os.path.join(STATUTE_DIR, "statutes.idx"))
+STATUTE_CACHE_SIZE = int(os.getenv("ROWAN_STATUTE_CACHE_SIZE", "4096"))
+
+# Index layout: MAGIC, header length (u64 little-endian), JSON header, then one
+# JSON record per section at the offsets the header lists.
+MAGIC = b"RWSTAT01"
+_LENGTH = struct.Struct("<Q")
+INDEX_FORMAT = 1
+
+
+def normalize_section_id(section_id: str) -> str:
+    """'nrs  432b.220' and 'NRS 432B.220' name the same section."""
+    return " ".join(section_id.split()).upper()
+
+# ----------------------
+# SECTIONS
+# ----------------------
+class StatuteSection(TokenizedText):
+    """
+    One statute section as interpret_statute's rule_text, with the per-request
+    work done at ingest: its word set, its vague-term count and the canon
+    keyword triggers it matches. Trigger matches are tied to the config
+    version they were computed against and recomputed (once) for any other.
+    """
+    def __init__(self, section_id: str, title: str, text: str, token_set: FrozenSet[str], vague_count: int,
+                 canon_matches: FrozenSet[Tuple[str, int]], config_version: str):
+        super().__init__(text)
+        self.section_id = section_id
+        self.title = title
+        self.__dict__["token_set"] = token_set   # fills the cached_property
+        self.vague_count = vague_count
+        self._canon_matches = {config_version: canon_matches}
+
+    def canon_matches(self, snapshot) -> FrozenSet[Tuple[str, int]]:
+        """(phase, position) of every canon whose trigger keywords occur in the section."""
+        matches = self._canon_matches.get(snapshot.version)
+        if matches is None:
+            matches = frozenset(snapshot.compiled("canon_index").matches(self.lower))
+            self._canon_matches[snapshot.version] = matches
+        return matches
+
+
+def load_sections(source_dir: str = STATUTE_DIR) -> List[Dict]:
+    """
+    Read every *.json file in source_dir: a list of {"id", "text", "title"?}
+    objects, or {"sections": [...]}. Ids are normalized and must be unique.
+    """
+    sections, seen = [], {}
+    for path in sorted(glob.glob(os.path.join(source_dir, "*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        entries = data.get("sections") if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            raise ValueError(f"{path}: expected a list of sections or {{\"sections\": [...]}}")
+        for entry in entries:
+            if not isinstance(entry, dict) or not entry.get("id") or not isinstance(entry.get("text"), str):
+                raise ValueError(f"{path}: every section needs an id and a text")
+            section_id = normalize_section_id(entry["id"])
+            if section_id in seen:
+                raise ValueError(f"{path}: section {section_id} is also defined in {seen[section_id]}")
+            seen[section_id] = path
+            sections.append({"id": section_id, "title": entry.get("title", ""), "text": entry["text"]})
+    return sections
+
+# ----------------------
+# INGEST
+# ----------------------
+def build_index(sections: Iterable[Dict], index_path: str = STATUTE_INDEX, snapshot=None) -> Dict:
+    """
+    Write the on-disk index for `sections` (see load_sections) against the
+    current config snapshot. The file is replaced atomically, so running
+    workers keep reading the old one until they reopen.
+    """
+    from engines.ReadingLaw_Engine import VAGUE_TERMS, count_vague_terms
+
+    snapshot = snapshot or current_snapshot()
+    canon_index = snapshot.compiled("canon_index")
+    records, offsets = bytearray(), {}
+    for section in sections:
+        tokenized = TokenizedText(section["text"])
+        record = dumps({
+            "id": section["id"],
+            "title": section.get("title", ""),
+            "text": section["text"],
+            "tokens": sorted(tokenized.token_set),
+            "vague_count": count_vague_terms(tokenized.lower),
+            "canon_matches": sorted(canon_index.matches(tokenized.lower)),
+        })
+        offsets[section["id"]] = (len(records), len(record))
+        records += record
+
+    version = hashlib.sha256(records).hexdigest()[:12]
+    header = dumps({
+        "format": INDEX_FORMAT,
+        "version": version,
+        "config_version": snapshot.version,
+        "vague_terms": list(VAGUE_TERMS),
+        "sections": offsets,
+    })
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    tmp_path = f"{index_path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_LENGTH.pack(len(header)))
+        f.write(header)
+        f.write(records)
+    os.replace(tmp_path, index_path)
+    return {"path": index_path, "version": version, "sections": len(offsets),
+            "bytes": len(MAGIC) + _LENGTH.size + len(header) + len(records)}
+
+# ----------------------
+# MEMORY-MAPPED LIBRARY
+# ----------------------
+class StatuteLibrary:
+    """
+    Read-only view of a statute index.
+
+    The file is memory-mapped, so opening it costs only the header parse and
+    worker processes share its pages through the OS cache. A section is
+    decoded on first lookup and kept in a bounded LRU of StatuteSection objects,
+    which are immutable apart from their lazily filled caches and are shared
+    across requests.
+    """
+    def __init__(self, path: str = STATUTE_INDEX, cache_size: int = STATUTE_CACHE_SIZE):
+        from engines.ReadingLaw_Engine import VAGUE_TERMS
+
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}: not a statute index")
+        (header_length,) = _LENGTH.unpack_from(self._map, len(MAGIC))
+        header_start = len(MAGIC) + _LENGTH.size
+        header = loads(self._map[header_start:header_start + header_length])
+        if header.get("format") != INDEX_FORMAT:
+            raise ValueError(f"{path}: index format {header.get('format')}, expected {INDEX_FORMAT}; rebuild it")
+        self.version = header["version"]
+        self.config_version = header["config_version"]
+        # Counts from an older vague-term list are recomputed on decode.
+        self._vague_counts_current = header["vague_terms"] == list(VAGUE_TERMS)
+        self._sections = header["sections"]
+        self._records_start = header_start + header_length
+        self.cache_size = cache_size
+        self._decoded = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sections)
+
+    def __contains__(self, section_id: str):
+        return normalize_section_id(section_id) in self._sections
+
+    def ids(self) -> List[str]:
+        return list(self._sections)
+
+    def section(self, section_id: str) -> StatuteSection:
+        section_id = normalize_section_id(section_id)
+        with self._lock:
+            found = self._decoded.get(section_id)
+            if found is not None:
+                self._decoded.move_to_end(section_id)
+                return found
+        try:
+            offset, length = self._sections[section_id]
+        except KeyError:
+            raise KeyError(f"Unknown statute section: {section_id}") from None
+        start = self._records_start + offset
+        found = self._decode(loads(self._map[start:start + length]))
+        with self._lock:
+            self._decoded[section_id] = found
+            while len(self._decoded) > self.cache_size:
+                self._decoded.popitem(last=False)
+        return found
+
+    def _decode(self, record: Dict) -> StatuteSection:
+        section = StatuteSection(
+            record["id"], record["title"], record["text"], frozenset(record["tokens"]), record["vague_count"],
+            frozenset(tuple(match) for match in record["canon_matches"]), self.config_version
+        )
+        if not self._vague_counts_current:
+            from engines.ReadingLaw_Engine import count_vague_terms
+            section.vague_count = count_vague_terms(section.lower)
+        return section
+
+    def close(self):
+        self._map.close()
+
+
+_library: Optional[StatuteLibrary] = None
+_library_stamp = None
+_library_lock = threading.Lock()
+
+
+def statute_library(path: str = STATUTE_INDEX) -> StatuteLibrary:
+    """
+    The process's library, opened on first use and reopened when the index
+    file is replaced (one stat per call). Raises ValueError when there is no index.
+    """
+    global _library, _library_stamp
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise ValueError(f"No statute index at {path}; build one with python -m engines.Rowan_Statute_Library") from None
+    stamp = (path, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    library = _library
+    if library is not None and _library_stamp == stamp:
+        return library
+    with _library_lock:
+        if _library is None or _library_stamp != stamp:
+            # The replaced map is left to the garbage collector: requests may still hold its sections.
+            _library, _library_stamp = StatuteLibrary(path), stamp
+        return _library
+
+
+def preload_statute_library(path: str = STATUTE_INDEX) -> Optional[StatuteLibrary]:
+    """Map the index at startup if one has been built; deployments without statutes skip it."""
+    return statute_library(path) if os.path.exists(path) else None
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    # python -m engines.Rowan_Statute_Library [source_dir] [index_path]
+    source = sys.argv[1] if len(sys.argv) > 1 else STATUTE_DIR
+    target = sys.argv[2] if len(sys.argv) > 2 else STATUTE_INDEX
+    print(json.dumps(build_index(load_sections(source), target), indent=2))
@@ -1,17 +1,114 @@
-from Rowan_Logic_Engine import evaluate_argument
-from ReadingLaw_Engine import interpret_statute
-from Specter_Response_Generator import specter_response_engine
+from engines.Rowan_Analysis_Context import AnalysisContext
+from engines.Specter_Response_Generator import specter_response_engine
+from orchestrator.metrics import observe_stage
+from orchestrator.scheduler import Stage, run_stages
 
+# ----------------------
+# STAGES
+# ----------------------
+def logic_stage(user_input: str, analysis_context: AnalysisContext):
+    logic_raw = analysis_context.logic(user_input)
+    if not logic_raw:
+        return None
+    return {
+        "score": round(logic_raw.get("adjusted_score", 0), 3),
+        "analysis": logic_raw.get("analysis"),
+        "fallacies": logic_raw.get("fallacies", []),
+        "razors": logic_raw.get("razors", [])
+    }
+
+def canon_stage(user_input: str, analysis_context: AnalysisContext, statute=None):
+    """Canon interpretation of the input against a statute section, or against itself when none is given."""
+    canon_raw = analysis_context.canon(user_input, statute if statute is not None else user_input, mode="json")
+    if not canon_raw:
+        return None
+    return {
+        "score": round(canon_raw.get("score", 0), 3),
+        "top_interpretation": canon_raw.get("top_interpretation"),
+        "applied_canons": canon_raw.get("applied_canons", []),
+        "warning": canon_raw.get("warning"),
+        "alternatives": canon_raw.get("alternatives", [])
+    }
+
+def weighting_stage(mode: str, weighting: dict, logic_result, canon_result):
+    """Weighted score plus the mode-specific status and recommendations."""
+    logic_score = logic_result["score"] if logic_result else 0
+    canon_score = canon_result["score"] if canon_result else 0
+
+    weighted_score = round(
+        (logic_score * weighting["logic"]) +
+        (canon_score * weighting["canon"]),
+        3
+    )
+
+    status = "in_progress"
+    recommendations = []
+    if mode == "analysis":
+        status = "validated" if weighted_score >= 0.9 else "issues_detected"
+        if status == "issues_detected":
+            recommendations.append("Tighten logical structure or reinforce statutory interpretation.")
+
+    elif mode == "adversarial":
+        status = "attack_report"
+        if logic_result:
+            fallacies = [f["fallacy"] for f in logic_result.get("fallacies", [])]
+            if fallacies:
+                recommendations.append(f"Exploit these reasoning flaws: {', '.join(fallacies)}")
+        if canon_result and canon_result.get("warning"):
+            recommendations.append("Leverage canon conflicts or warnings for counterargument advantage.")
+
+    elif mode == "strategy":
+        status = "strategic_synthesis"
+        recommendations.append("Anchor persuasion in canons with highest interpretive weight.")
+        if logic_result:
+            recommendations.append("Apply Occam and Hitchens razors to streamline complexity.")
+
+    return {"weighted_score": weighted_score, "status": status, "recommendations": recommendations}
+
+def persona_stage(user_input: str, mode: str, analysis_context: AnalysisContext, logic_result, canon_result, weighted_score,
+                  seed=None):
+    return specter_response_engine(
+        text=user_input,
+        claim=f"{mode.upper()} MODE | Weighted Score: {weighted_score}",
+        facts=[],
+        rules=canon_result.get("applied_canons", []) if canon_result else [],
+        razors=[r.get("razor") for r in logic_result.get("razors", [])] if logic_result else [],
+        fallacies=[f.get("fallacy") for f in logic_result.get("fallacies", [])] if logic_result else [],
+        analysis_context=analysis_context,
+        seed=seed
+    )
+
+# Stage name -> streamed event name. The logic stage is not streamed here because
+# the intention engine already emitted logic_evaluation for the same analysis.
+STAGE_EVENTS = {"canon": "canon_interpretation", "weighting": "weighting", "persona": "persona"}
+
+# ----------------------
+# TASK ENGINE
+# ----------------------
 def task_engine(payload: dict) -> dict:
     """
     Executes workflows based on mode and adaptive completeness rules with normalized scoring.
     Pacific Region update for clarity and uniform deployment.
+    Reuses the caller's AnalysisContext (payload["analysis_context"]) so logic and
+    canon results already computed for this request are not recomputed.
+
+    The work is a small DAG: logic and canon are independent and run concurrently,
+    weighting needs both, persona needs all three. Stages whose need is absent are
+    skipped. Per-stage wall times (ms) are returned under "timings". Called from
+    process_intention, both results are already in the context (the logic gate
+    computed logic and canon overlapped it), so those two stages are lookups.
+    payload["on_event"], if given, receives (event, data) as each stage finishes.
+    payload["seed"], if given, fixes the persona layer's random choices.
+    payload["statute"], a StatuteSection, is the rule text for the canon stage,
+    which then always runs.
     """
 
     mode = payload.get("mode", "analysis")
     user_input = payload.get("user_input", "")
     directive = payload.get("directive", {})
     needs = directive.get("execution_policy", {}).get("needs", [])
+    analysis_context = payload.get("analysis_context") or AnalysisContext()
+    statute = payload.get("statute")
 
     # Initialize container
     results = {
@@ -31,71 +128,32 @@ def task_engine(payload: dict) -> dict:
         results["weighting"] = {"logic": 0.5, "canon": 0.5}
     elif mode == "strategy":
         results["weighting"] = {"logic": 0.4, "canon": 0.6}
+    weighting = results["weighting"]
 
-    # Pull Logic Engine if needed
-    if "logic" in needs:
-        logic_raw = evaluate_argument(user_input)
-        if logic_raw:
-            results["logic_result"] = {
-                "score": round(logic_raw.get("adjusted_score", 0), 3),
-                "analysis": logic_raw.get("analysis"),
-                "fallacies": logic_raw.get("fallacies", {}),
-                "razors": logic_raw.get("razors", {})
-            }
-
-    # Pull ReadingLaw Engine if needed
-    if "canon" in needs:
-        canon_raw = interpret_statute(user_input, user_input, mode="json")
-        if canon_raw:
-            results["canon_result"] = {
-                "score": round(canon_raw.get("score", 0), 3),
-                "top_interpretation": canon_raw.get("top_interpretation"),
-                "applied_canons": canon_raw.get("applied_canons", []),
-                "warning": canon_raw.get("warning"),
-                "alternatives": canon_raw.get("alternatives", [])
-            }
-
-    # Compute weighted score
-    logic_score = results["logic_result"]["score"] if results["logic_result"] else 0
-    canon_score = results["canon_result"]["score"] if results["canon_result"] else 0
+    stages = [
+        Stage("logic", lambda _: logic_stage(user_input, analysis_context), enabled="logic" in needs),
+        Stage("canon", lambda _: canon_stage(user_input, analysis_context, statute),
+              enabled="canon" in needs or statute is not None),
+        Stage("weighting", lambda r: weighting_stage(mode, weighting, r["logic"], r["canon"]),
+              inputs=("logic", "canon")),
+        Stage("persona", lambda r: persona_stage(user_input, mode, analysis_context, r["logic"], r["canon"],
+                                                 r["weighting"]["weighted_score"], payload.get("seed")),
+              inputs=("logic", "canon", "weighting")),
+    ]
+    on_event = payload.get("on_event")
 
-    weighted_score = round(
-        (logic_score * results["weighting"]["logic"]) +
-        (canon_score * results["weighting"]["canon"]),
-        3
-    )
-
-    # Mode-specific actions
-    if mode == "analysis":
-        results["status"] = "validated" if weighted_score >= 0.9 else "issues_detected"
-        if results["status"] == "issues_detected":
-            results["recommendations"].append("Tighten logical structure or reinforce statutory interpretation.")
+    def on_complete(name, output, elapsed_ms):
+        observe_stage(f"task.{name}", elapsed_ms, analysis_context.timings)
+        if on_event and name in STAGE_EVENTS:
+            on_event(STAGE_EVENTS[name], {"result": output, "ms": elapsed_ms})
 
-    elif mode == "adversarial":
-        results["status"] = "attack_report"
-        if results["logic_result"]:
-            fallacies = [f["fallacy"] for f in results["logic_result"].get("fallacies", {}).get("detected_fallacies", [])]
-            if fallacies:
-                results["recommendations"].append(f"Exploit these reasoning flaws: {', '.join(fallacies)}")
-        if results["canon_result"] and results["canon_result"].get("warning"):
-            results["recommendations"].append("Leverage canon conflicts or warnings for counterargument advantage.")
-
-    elif mode == "strategy":
-        results["status"] = "strategic_synthesis"
-        results["recommendations"].append("Anchor persuasion in canons with highest interpretive weight.")
-        if results["logic_result"]:
-            results["recommendations"].append("Apply Occam and Hitchens razors to streamline complexity.")
-
-    # Persona Feedback Layer
-    results["persona_response"] = specter_response_engine(
-        text=user_input,
-        claim=f"{mode.upper()} MODE | Weighted Score: {weighted_score}",
-        facts=[],
-        rules=results["canon_result"].get("applied_canons", []) if results["canon_result"] else [],
-        razors=[r.get("razor") for r in results["logic_result"].get("razors", {}).get("matched_razors", [])] if results["logic_result"] else [],
-        fallacies=[f.get("fallacy") for f in results["logic_result"].get("fallacies", {}).get("detected_fallacies", [])] if results["logic_result"] else []
-    )
+    outputs, timings = run_stages(stages, on_complete=on_complete)
 
-    results["final_score"] = weighted_score
+    results["logic_result"] = outputs["logic"]
+    results["canon_result"] = outputs["canon"]
+    results["recommendations"] = outputs["weighting"]["recommendations"]
+    results["persona_response"] = outputs["persona"]
+    results["final_score"] = outputs["weighting"]["weighted_score"]
     results["status"] = "complete"
+    results["timings"] = timings
     return results
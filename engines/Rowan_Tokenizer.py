@@ -0,0 +1,87 @@
+import re
+from bisect import bisect_left
+from functools import cached_property
+from typing import FrozenSet, List, Tuple, Union
+
+_NON_WORD = re.compile(r'[^a-z0-9\s]')
+_SENTENCE = re.compile(r'[^.!?]+')
+_TOKEN = re.compile(r'\S+')
+
+# ===================================
+# String Helpers
+# ===================================
+def normalize_text(text: str) -> str:
+    return _NON_WORD.sub('', text.lower())
+
+def segment_spans(text: str) -> List[Tuple[int, int]]:
+    """Return (start, end) offsets of the stripped sentences produced by segment_text."""
+    spans = []
+    for m in _SENTENCE.finditer(text):
+        chunk = m.group()
+        stripped = chunk.strip()
+        if stripped:
+            start = m.start() + (len(chunk) - len(chunk.lstrip()))
+            spans.append((start, start + len(stripped)))
+    return spans
+
+def segment_text(text: str) -> List[str]:
+    return [text[start:end] for start, end in segment_spans(text)]
+
+# ===================================
+# Tokenized Text
+# ===================================
+class TokenizedText:
+    """
+    One input string with everything the engines derive from it.
+
+    Each view is computed on first use and then kept, so a request that
+    builds one TokenizedText (AnalysisContext does) lowercases, normalizes,
+    splits and segments its input once however many engines read it. Every
+    engine entry point accepts a TokenizedText wherever it accepts a string.
+    """
+    def __init__(self, text: str):
+        self.text = text
+
+    def __len__(self):
+        return len(self.text)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def normalized(self) -> str:
+        """normalize_text(text): lowercase with everything but [a-z0-9] and whitespace dropped."""
+        return _NON_WORD.sub('', self.lower)
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Whitespace tokens of the lowercased text."""
+        return self.lower.split()
+
+    @cached_property
+    def token_set(self) -> FrozenSet[str]:
+        return frozenset(self.tokens)
+
+    @cached_property
+    def token_starts(self) -> List[int]:
+        """Offset into text of each whitespace token, in order."""
+        return [m.start() for m in _TOKEN.finditer(self.text)]
+
+    @cached_property
+    def sentence_spans(self) -> List[Tuple[int, int]]:
+        return segment_spans(self.text)
+
+    def sentences(self) -> List[str]:
+        return [self.text[start:end] for start, end in self.sentence_spans]
+
+    def token_count(self, start: int = 0, end: int = None) -> int:
+        """Number of tokens starting inside text[start:end], without slicing the text."""
+        starts = self.token_starts
+        stop = len(starts) if end is None else bisect_left(starts, end)
+        return stop - bisect_left(starts, start)
+
+
+def tokenize(text: Union[str, TokenizedText]) -> TokenizedText:
+    """Wrap a string once; a TokenizedText is passed through unchanged."""
+    return text if isinstance(text, TokenizedText) else TokenizedText(text)
@@ -2,6 +2,8 @@ import re
 import random
 import json
 
+from engines.Rowan_Tokenizer import tokenize
+
 # ----------------------
 # Persona Patterns
 # ----------------------
@@ -44,7 +46,8 @@ def style_scrubber(text):
 # ----------------------
 # WTF Index Detection (Severity)
 # ----------------------
-def calculate_wtf_index(text):
+def calculate_wtf_index(text, lowered=None):
+    lowered = tokenize(text).lower if lowered is None else lowered
     severity_keywords = {
         4: ["fraud", "child abuse", "obstruction", "duty breach", "conflict of interest"],
         3: ["misconduct", "abuse of process", "perjury", "silence", "failure"],
@@ -53,16 +56,17 @@ def calculate_wtf_index(text):
     }
     score = 0
     for level, words in severity_keywords.items():
-        if any(word in text.lower() for word in words):
+        if any(word in lowered for word in words):
             score = max(score, level)
     return score
 
 # ----------------------
 # Ethical Breach Detector (for Shadow)
 # ----------------------
-def detect_breach(text):
+def detect_breach(text, lowered=None):
+    lowered = tokenize(text).lower if lowered is None else lowered
     breach_terms = ["duty breach", "conflict of interest", "silence", "omission", "intent"]
-    return any(term in text.lower() for term in breach_terms)
+    return any(term in lowered for term in breach_terms)
 
 # ----------------------
 # Monologue Generator
@@ -96,12 +100,15 @@ def choose_persona(mode, severity, breach_detected):
 # ----------------------
 # Main Engine Response
 # ----------------------
-def specter_response_engine(text, claim, facts, rules, razors, fallacies, mode="analysis"):
-    severity = calculate_wtf_index(text)
-    breach_detected = detect_breach(text)
+def specter_response_engine(text, claim, facts, rules, razors, fallacies, mode="analysis", analysis_context=None, seed=None):
+    # A seed (e.g. the result-cache key) makes persona picks repeatable for the same request.
+    rng = random.Random(seed) if seed is not None else random
+    lowered = (analysis_context.text(text) if analysis_context is not None else tokenize(text)).lower
+    severity = calculate_wtf_index(text, lowered)
+    breach_detected = detect_breach(text, lowered)
 
     persona = choose_persona(mode, severity, breach_detected)
-    killshot = random.choice(PERSONA_PATTERNS[persona])
+    killshot = rng.choice(PERSONA_PATTERNS[persona])
     killshot = style_scrubber(killshot)
 
     response = {
@@ -119,15 +126,15 @@ def specter_response_engine(text, claim, facts, rules, razors, fallacies, mode="
         },
         "advisory": generate_monologue(mode),
         "persona_options": {
-            "Harvey": random.choice(PERSONA_PATTERNS["Harvey"]),
-            "Shadow": random.choice(PERSONA_PATTERNS["Shadow"]),
-            "Abyss": random.choice(PERSONA_PATTERNS["Abyss"]),
-            "Formal": random.choice(PERSONA_PATTERNS["Formal"]),
-            "Diplomat": random.choice(PERSONA_PATTERNS["Diplomat"])
+            "Harvey": rng.choice(PERSONA_PATTERNS["Harvey"]),
+            "Shadow": rng.choice(PERSONA_PATTERNS["Shadow"]),
+            "Abyss": rng.choice(PERSONA_PATTERNS["Abyss"]),
+            "Formal": rng.choice(PERSONA_PATTERNS["Formal"]),
+            "Diplomat": rng.choice(PERSONA_PATTERNS["Diplomat"])
         }
     }
 
-    return json.dumps(response, indent=4)
+    return response
 
 # ----------------------
 # TEST EXAMPLE
@@ -143,4 +150,4 @@ if __name__ == "__main__":
     razors = ["Occam's Razor", "Hitchens' Razor"]
     fallacies = ["Framing Effect", "Appeal to Authority"]
 
-    print(specter_response_engine(sample_text, claim, facts, rules, razors, fallacies, mode="strategy"))
+    print(json.dumps(specter_response_engine(sample_text, claim, facts, rules, razors, fallacies, mode="strategy"), indent=4))
@@ -0,0 +1,46 @@
+"""
+Production server: gunicorn forking uvicorn workers from a preloaded parent.
+
+    gunicorn -c gunicorn.conf.py app.main:app        (what start.sh runs)
+
+The parent imports the app (preload_app) and, in on_starting, loads the
+configs, compiles the engines and maps the statute index once (see
+app.warmup.preload); the workers it forks share those pages copy-on-write.
+Each worker then runs its startup hook, which warms the pipeline up before
+the worker accepts connections; GET /ready reports the result.
+
+Environment: PORT, ROWAN_WORKERS (default: one per CPU), ROWAN_WORKER_TIMEOUT,
+ROWAN_WARMUP, ROWAN_WARMUP_PASSES and ROWAN_WARMUP_CHUNK_POOL. The worker
+count is passed on to the app as ROWAN_SERVER_WORKERS, so each worker's chunk
+pool takes its share of the CPUs rather than all of them (but at least two
+processes on a multi-core machine; ROWAN_CHUNK_WORKERS overrides it). Workers
+share their metrics through ROWAN_METRICS_DIR (default: a fresh temporary
+directory, removed on exit), so /metrics reports the whole server whichever
+worker answers.
+"""
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("ROWAN_WORKERS", "0")) or os.cpu_count() or 1
+# Read by engines.Rowan_Chunked_Analysis, imported after this file (preload_app).
+os.environ["ROWAN_SERVER_WORKERS"] = str(workers)
+_own_metrics_dir = not os.getenv("ROWAN_METRICS_DIR")
+if _own_metrics_dir:
+    os.environ["ROWAN_METRICS_DIR"] = tempfile.mkdtemp(prefix="rowan-metrics-")
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("ROWAN_WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+
+
+def on_starting(server):
+    # With preload_app the app module is already imported here, before any fork.
+    from app.warmup import preload
+    preload()
+
+
+def on_exit(server):
+    if _own_metrics_dir:
+        shutil.rmtree(os.environ["ROWAN_METRICS_DIR"], ignore_errors=True)
@@ -0,0 +1,394 @@
+import atexit
+import bisect
+import glob
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from orchestrator.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# ----------------------
+# CONFIG
+# ----------------------
+METRICS_ENABLED = os.getenv("ROWAN_METRICS", "1") != "0"
+# Directory shared by all server workers (gunicorn.conf.py sets one); unset = this process only.
+METRICS_DIR = os.getenv("ROWAN_METRICS_DIR") or None
+METRICS_FLUSH_SECONDS = float(os.getenv("ROWAN_METRICS_FLUSH_SECONDS", "5"))
+# Seconds; spans a sub-millisecond gate check up to a chunked 50-page brief.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+# ----------------------
+# METRIC TYPES
+# ----------------------
+class _Metric:
+    """Base for labelled metrics; values are keyed by the tuple of label values."""
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def values(self) -> list:
+        with self._lock:
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+    def state(self) -> Dict:
+        """Plain, JSON-ready description and values; what render_state and merge_states work on."""
+        return {"help": self.help, "kind": self.kind, "labelnames": list(self.labelnames), "values": self.values()}
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram; each observation costs one bisect and one locked update."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                # [per-bucket counts (last one is +Inf), sum, count]
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def values(self):
+        with self._lock:
+            return [[list(labels), [list(counts), total, count]] for labels, (counts, total, count) in self._values.items()]
+
+    def state(self):
+        return dict(super().state(), buckets=list(self.buckets))
+
+
+class _Callback(_Metric):
+    """A value read at scrape time, e.g. a cache's own hit counter."""
+
+    def __init__(self, name: str, help_text: str, kind: str, read: Callable[[], float]):
+        super().__init__(name, help_text)
+        self.kind = kind
+        self.read = read
+
+    def values(self):
+        return [[[], self.read()]]
+
+class _InFlight(_Metric):
+    """Gauge derived at scrape time: per label set, starts counted minus finishes the histogram has seen."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, started: Counter, finished: Histogram):
+        super().__init__(name, help_text, started.labelnames)
+        self.started = started
+        self.finished = finished
+
+    def values(self):
+        with self.started._lock:
+            started = dict(self.started._values)
+        with self.finished._lock:
+            finished = {labels: entry[2] for labels, entry in self.finished._values.items()}
+        return [[list(labels), count - finished.get(labels, 0)] for labels, count in started.items()]
+
+# ----------------------
+# EXPOSITION AND AGGREGATION
+# ----------------------
+def render_state(state: Dict[str, Dict]) -> str:
+    """Prometheus text exposition of a registry state (MetricsRegistry.state or merge_states)."""
+    lines = []
+    for name, metric in state.items():
+        lines += [f"# HELP {name} {metric['help']}", f"# TYPE {name} {metric['kind']}"]
+        labelnames = tuple(metric["labelnames"])
+        for labels, value in metric["values"]:
+            if metric["kind"] == "histogram":
+                counts, total, count = value
+                cumulative = 0
+                for bound, n in zip(metric["buckets"] + [float("inf")], counts):
+                    cumulative += n
+                    le = f'le="{_format_value(float(bound))}"'
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labelnames, labels)} {count}")
+            else:
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def merge_states(states: Iterable[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """
+    Sum registry states from several processes, label set by label set;
+    histograms add bucket counts, sums and counts.
+    """
+    merged: Dict[str, Dict] = {}
+    for state in states:
+        for name, metric in state.items():
+            target = merged.setdefault(name, dict(metric, values={}))
+            histogram = metric["kind"] == "histogram"
+            for labels, value in metric["values"]:
+                key = tuple(labels)
+                current = target["values"].get(key)
+                if current is None:
+                    target["values"][key] = [list(value[0]), value[1], value[2]] if histogram else value
+                elif histogram:
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+                    current[2] += value[2]
+                else:
+                    target["values"][key] = current + value
+    for metric in merged.values():
+        metric["values"] = [[list(labels), value] for labels, value in metric["values"].items()]
+    return merged
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+# ----------------------
+# REGISTRY
+# ----------------------
+class MetricsRegistry:
+    """
+    Metrics rendered in the Prometheus text exposition format.
+
+    Recording is process-local and lock-cheap. A scrape reaches only one of the
+    server's worker processes, so with a shared `directory` every worker
+    writes its state there as <pid>.json (every ROWAN_METRICS_FLUSH_SECONDS
+    and on exit), and render() answers with the sum over all of them: other
+    workers' numbers lag by at most one flush interval. Counters and
+    histograms of workers that have exited are still counted, so totals
+    never go backwards; their gauges are dropped.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.directory = directory
+        self._flusher = None
+
+    def _add(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def callback(self, name: str, help_text: str, read: Callable[[], float], kind: str = "gauge"):
+        return self._add(_Callback(name, help_text, kind, read))
+
+    def in_flight(self, name: str, help_text: str, started: Counter, finished: Histogram):
+        return self._add(_InFlight(name, help_text, started, finished))
+
+    def state(self) -> Dict[str, Dict]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.state() for metric in metrics}
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"{pid}.json")
+
+    def flush(self):
+        """Write this process's state to the shared directory, replacing its previous file atomically."""
+        path = self._path(os.getpid())
+        with open(path + ".tmp", "wb") as f:
+            f.write(dumps(self.state()))
+        os.replace(path + ".tmp", path)
+
+    def share(self, interval: float = METRICS_FLUSH_SECONDS):
+        """
+        Start flushing this worker's state to the shared directory. Call it in
+        each worker after the fork, like the config watcher: threads do not
+        survive one.
+        """
+        if self.directory is None or self._flusher is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self.flush()
+        atexit.register(self.flush)
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Could not write metrics to %s", self.directory)
+
+        self._flusher = threading.Thread(target=loop, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+
+    def _worker_states(self):
+        own = os.getpid()
+        yield self.state()
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            pid = int(os.path.basename(path)[:-len(".json")])
+            if pid == own:
+                continue
+            try:
+                with open(path, "rb") as f:
+                    state = loads(f.read())
+            except (OSError, ValueError):
+                continue
+            if not _alive(pid):
+                state = {name: metric for name, metric in state.items() if metric["kind"] != "gauge"}
+            yield state
+
+    def render(self) -> str:
+        if self.directory is None or self._flusher is None:
+            return render_state(self.state())
+        return render_state(merge_states(self._worker_states()))
+
+
+METRICS = MetricsRegistry(METRICS_DIR)
+
+STAGE_SECONDS = METRICS.histogram("rowan_stage_duration_seconds", "Wall time per pipeline stage.", ("stage",))
+STAGE_ERRORS = METRICS.counter("rowan_stage_errors_total", "Stages that raised.", ("stage",))
+STAGE_STARTED = METRICS.counter("rowan_stage_started_total", "Stages started.", ("stage",))
+STAGE_IN_FLIGHT = METRICS.in_flight("rowan_stage_in_flight", "Stages currently running.", STAGE_STARTED, STAGE_SECONDS)
+HTTP_SECONDS = METRICS.histogram("rowan_http_request_duration_seconds", "Wall time per HTTP request.", ("handler",))
+HTTP_REQUESTS = METRICS.counter("rowan_http_requests_total", "HTTP requests by handler and status.", ("handler", "status"))
+HTTP_IN_FLIGHT = METRICS.gauge("rowan_http_requests_in_flight", "HTTP requests currently being served.")
+
+# ----------------------
+# STAGE INSTRUMENTATION
+# ----------------------
+def observe_stage(stage: str, elapsed_ms: Optional[float], timings: Optional[Dict] = None):
+    """Record a stage timed elsewhere (e.g. by run_stages); None means it was skipped."""
+    if elapsed_ms is None:
+        return
+    if METRICS_ENABLED:
+        STAGE_STARTED.inc(stage)
+        STAGE_SECONDS.observe(elapsed_ms / 1000, stage)
+    if timings is not None:
+        timings[stage] = elapsed_ms
+
+
+class stage_timer:
+    """
+    Context manager timing the enclosed block as `stage`: latency histogram,
+    started and error counters, plus timings[stage] = ms when a per-request
+    dict is given.
+
+    A slotted class rather than a @contextmanager generator, and the in-flight
+    gauge is derived from the started counter at scrape time, so a stage costs
+    two locked updates in all.
+    """
+    __slots__ = ("stage", "timings", "start")
+
+    def __init__(self, stage: str, timings: Optional[Dict] = None):
+        self.stage = stage
+        self.timings = timings
+
+    def __enter__(self):
+        if METRICS_ENABLED:
+            STAGE_STARTED.inc(self.stage)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        if METRICS_ENABLED:
+            STAGE_SECONDS.observe(elapsed, self.stage)
+            if exc_type is not None:
+                STAGE_ERRORS.inc(self.stage)
+        if self.timings is not None:
+            self.timings[self.stage] = round(elapsed * 1000, 3)
+        return False
+
+# ----------------------
+# HTTP INSTRUMENTATION
+# ----------------------
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware counting and timing HTTP requests.
+
+    Requests are labelled by the name of the endpoint the router matched, not
+    the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            endpoint = scope.get("endpoint")
+            handler = getattr(endpoint, "__name__", "unmatched")
+            HTTP_SECONDS.observe(time.perf_counter() - start, handler)
+            HTTP_REQUESTS.inc(handler, str(status[0]))
@@ -1,9 +1,68 @@
+import queue
+import threading
+
 from engines.Rowan_Intention_Engine import process_intention
+from engines.Rowan_Analysis_Context import AnalysisContext
+from engines.Rowan_Config_Registry import current_snapshot
+from orchestrator.serialization import dumps, project
 
-def run_pipeline(user_input: str, mode: str = None, session_id: str = "default"):
+def run_pipeline(user_input: str, mode: str = None, session_id: str = "default", analysis_context: AnalysisContext = None,
+                 on_event=None, statute_id: str = None, use_cache: bool = True):
     """
     Main orchestration entry point.
     Delegates to Rowan Intention Engine which calls Task Engine and other layers.
+    `statute_id` reads the input against that statute library section;
+    `use_cache=False` skips the result cache and request coalescing.
     """
-    result = process_intention(user_input=user_input, mode=mode, session_id=session_id)
+    result = process_intention(user_input=user_input, mode=mode, session_id=session_id, analysis_context=analysis_context,
+                               on_event=on_event, statute_id=statute_id, use_cache=use_cache)
     return result
+
+def stream_pipeline(user_input: str, mode: str = None, session_id: str = "default", fields: str = None,
+                    statute_id: str = None):
+    """
+    Run the pipeline on a worker thread and yield NDJSON lines as stages finish:
+    one {"event": <stage>, "data": ...} line per stage, then a final
+    {"event": "result", "data": <run_pipeline result>} or {"event": "error", ...}.
+    `fields` (see orchestrator.serialization.Projection) is applied to the final result.
+    """
+    events = queue.Queue()
+
+    def work():
+        try:
+            result = run_pipeline(user_input, mode, session_id,
+                                  on_event=lambda name, data: events.put({"event": name, "data": data}),
+                                  statute_id=statute_id)
+            events.put({"event": "result", "data": project(result, fields)})
+        except Exception as e:
+            events.put({"event": "error", "error": str(e)})
+        finally:
+            events.put(None)
+
+    threading.Thread(target=work, name="rowan-stream", daemon=True).start()
+    while True:
+        event = events.get()
+        if event is None:
+            break
+        yield dumps(event) + b"\n"
+
+def run_batch(items: list, timings: bool = False):
+    """
+    Run many (user_input, mode, session_id[, statute_id]) items through the pipeline in order.
+    Every item sees the same config snapshot, but each gets its own AnalysisContext,
+    so an item's memo is released once it is done and its timings are its own;
+    `timings=True` adds them to each result as in /orchestrate.
+    A failing item is reported in place and does not stop the batch.
+    """
+    snapshot = current_snapshot()
+    results = []
+    for index, (user_input, mode, session_id, *statute) in enumerate(items):
+        try:
+            analysis_context = AnalysisContext(snapshot)
+            result = run_pipeline(user_input, mode, session_id, analysis_context, statute_id=statute[0] if statute else None)
+            if timings:
+                result["timings"] = analysis_context.timings
+            results.append({"index": index, "ok": True, "result": result})
+        except Exception as e:
+            results.append({"index": index, "ok": False, "error": str(e)})
+    return results
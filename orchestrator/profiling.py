@@ -0,0 +1,176 @@
+import io
+import json
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ----------------------
+# CONFIG
+# ----------------------
+# Fraction of requests profiled without being asked; 0 disables sampling.
+PROFILE_SAMPLE_RATE = float(os.getenv("ROWAN_PROFILE_SAMPLE_RATE", "0"))
+# Whether clients may ask for a profile with the X-Rowan-Profile header ("cpu" or "cpu,memory").
+PROFILE_ALLOW_HEADER = os.getenv("ROWAN_PROFILE_ALLOW_HEADER", "0") == "1"
+# Also trace allocations for sampled requests; header requests opt in with "memory".
+PROFILE_MEMORY = os.getenv("ROWAN_PROFILE_MEMORY", "0") == "1"
+PROFILE_DIR = os.getenv("ROWAN_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "rowan-profiles"))
+PROFILE_TOP = int(os.getenv("ROWAN_PROFILE_TOP", "25"))
+TRACEMALLOC_FRAMES = 8
+
+PROFILE_HEADER = "X-Rowan-Profile"
+_SAFE_ID = re.compile(r"[^A-Za-z0-9_-]")
+
+# cProfile, pstats, tracemalloc and uuid are imported on first use, so workers that
+# never profile do not load them.
+# cProfile and tracemalloc are process-wide, so one request is profiled at a time;
+# a request arriving while another is being profiled simply runs unprofiled.
+_profile_lock = threading.Lock()
+
+
+class ProfileRequest(NamedTuple):
+    request_id: str
+    memory: bool
+
+
+def _new_request_id() -> str:
+    import uuid
+    return uuid.uuid4().hex
+
+
+def profile_request(header: Optional[str] = None, request_id: Optional[str] = None) -> Optional[ProfileRequest]:
+    """
+    Decide whether this request is profiled: by the X-Rowan-Profile header when
+    ROWAN_PROFILE_ALLOW_HEADER=1, otherwise by ROWAN_PROFILE_SAMPLE_RATE.
+    Returns None (the common case) when it is not.
+    """
+    if header and PROFILE_ALLOW_HEADER:
+        memory = "memory" in header.lower()
+    elif PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        memory = PROFILE_MEMORY
+    else:
+        return None
+    request_id = _SAFE_ID.sub("_", request_id or "")[:64] or _new_request_id()
+    return ProfileRequest(request_id, memory)
+
+# ----------------------
+# REPORTS
+# ----------------------
+def _top_functions(stats: "pstats.Stats", sort: str, limit: int):
+    stats.sort_stats(sort)
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        calls, primitive, tottime, cumtime, _ = stats.stats[func]
+        filename, line, name = func
+        rows.append({"function": f"{name} ({os.path.basename(filename)}:{line})", "calls": calls,
+                     "tottime_ms": round(tottime * 1000, 3), "cumtime_ms": round(cumtime * 1000, 3)})
+    return rows
+
+
+def _top_allocations(snapshot: "tracemalloc.Snapshot", limit: int):
+    import tracemalloc
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ))
+    rows = []
+    for stat in snapshot.statistics("traceback")[:limit]:
+        frame = stat.traceback[-1]
+        rows.append({"site": f"{os.path.basename(frame.filename)}:{frame.lineno}", "kb": round(stat.size / 1024, 1),
+                     "blocks": stat.count, "traceback": [f"{f.filename}:{f.lineno}" for f in stat.traceback]})
+    return rows
+
+
+def _write_report(directory: str, profiler: "cProfile.Profile", summary: Dict):
+    import pstats
+    os.makedirs(directory, exist_ok=True)
+    profiler.dump_stats(os.path.join(directory, "profile.pstats"))
+    with open(os.path.join(directory, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    text = io.StringIO()
+    pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(PROFILE_TOP)
+    with open(os.path.join(directory, "profile.txt"), "w", encoding="utf-8") as f:
+        f.write(text.getvalue())
+
+# ----------------------
+# PROFILED RUN
+# ----------------------
+def run_profiled(request: Optional[ProfileRequest], fn: Callable, *args, **kwargs) -> Tuple[object, Optional[Dict]]:
+    """
+    Call fn(*args, **kwargs) under cProfile (and tracemalloc if requested) and
+    write profile.pstats, profile.txt and summary.json (top functions and
+    allocation sites) to PROFILE_DIR/<request_id>/.
+
+    Returns (result, summary). When `request` is None, or another request is
+    already being profiled, fn simply runs and the summary is None.
+    cProfile sees only the calling thread: work handed to the stage executor or
+    the chunk pool shows up as the wait for it.
+    """
+    if request is None or not _profile_lock.acquire(blocking=False):
+        return fn(*args, **kwargs), None
+    try:
+        import cProfile
+        import pstats
+        import tracemalloc
+
+        trace_memory = request.memory and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            result = profiler.runcall(fn, *args, **kwargs)
+        finally:
+            elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+            snapshot = tracemalloc.take_snapshot() if trace_memory else None
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+            if trace_memory:
+                tracemalloc.stop()
+
+        directory = os.path.join(PROFILE_DIR, request.request_id)
+        summary = {
+            "request_id": request.request_id,
+            "directory": directory,
+            "wall_ms": elapsed_ms,
+            "top_cumulative": _top_functions(pstats.Stats(profiler), "cumulative", PROFILE_TOP),
+            "top_self": _top_functions(pstats.Stats(profiler), "tottime", PROFILE_TOP),
+        }
+        if snapshot is not None:
+            summary["peak_traced_kb"] = round(peak / 1024, 1)
+            summary["top_allocations"] = _top_allocations(snapshot, PROFILE_TOP)
+        try:
+            _write_report(directory, profiler, summary)
+        except OSError:
+            logger.exception("Could not write profile for request %s", request.request_id)
+        else:
+            logger.info("Profiled request %s in %.1f ms: %s", request.request_id, elapsed_ms, directory)
+        return result, summary
+    finally:
+        _profile_lock.release()
+
+# ----------------------
+# LOCAL USE
+# ----------------------
+if __name__ == "__main__":
+    # python -m orchestrator.profiling "text to profile" [--memory]
+    from engines.Rowan_Config_Registry import current_snapshot
+    from orchestrator.orchestrator import run_pipeline
+
+    # Compile the rule tables first, so the profile shows the request rather than a cold start.
+    snapshot = current_snapshot()
+    snapshot.compiled("argument_analyzer")
+    snapshot.compiled("canon_index")
+    text = sys.argv[1] if len(sys.argv) > 1 else sys.stdin.read()
+    _, report = run_profiled(ProfileRequest(_new_request_id(), "--memory" in sys.argv), run_pipeline, text,
+                             use_cache=False)
+    print(json.dumps({k: report[k] for k in ("request_id", "directory", "wall_ms")}, indent=2))
+    for row in report["top_cumulative"][:10]:
+        print(f"{row['cumtime_ms']:>10.3f} ms  {row['function']}")
@@ -0,0 +1,71 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, NamedTuple, Tuple
+
+STAGE_WORKERS = int(os.getenv("ROWAN_STAGE_WORKERS", "4"))
+STAGE_EXECUTOR = ThreadPoolExecutor(max_workers=STAGE_WORKERS, thread_name_prefix="rowan-stage")
+
+
+class Stage(NamedTuple):
+    """One node of a pipeline DAG. `run` receives {input_name: upstream result}."""
+    name: str
+    run: Callable[[Dict], object]
+    inputs: Tuple[str, ...] = ()
+    enabled: bool = True
+
+
+def _timed(run, args):
+    start = time.perf_counter()
+    result = run(args)
+    return result, round((time.perf_counter() - start) * 1000, 3)
+
+
+def run_stages(stages: Iterable[Stage], executor=STAGE_EXECUTOR, on_complete=None):
+    """
+    Run stages as soon as all of their inputs are available.
+
+    Stages that become ready together run concurrently: all but one go to the
+    executor and the last runs on the calling thread. A disabled stage is
+    skipped, yields None to its dependents and is timed as None.
+    `on_complete(name, result, ms)` is called on the calling thread as each
+    stage finishes or is skipped.
+    Returns (results, timings_ms) keyed by stage name.
+    """
+    remaining = {stage.name: stage for stage in stages}
+    for stage in remaining.values():
+        missing = [i for i in stage.inputs if i not in remaining]
+        if missing:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {missing}")
+
+    results, timings, pending = {}, {}, {}
+
+    def finish(name, result, elapsed_ms):
+        results[name], timings[name] = result, elapsed_ms
+        if on_complete is not None:
+            on_complete(name, result, elapsed_ms)
+
+    while remaining or pending:
+        for future in [f for f in pending if f.done()]:
+            finish(pending.pop(future), *future.result())
+        ready = [s for s in remaining.values() if all(i in results for i in s.inputs)]
+        for stage in ready:
+            del remaining[stage.name]
+        runnable = []
+        for stage in ready:
+            if stage.enabled:
+                runnable.append(stage)
+            else:
+                finish(stage.name, None, None)
+        if runnable:
+            for stage in runnable[:-1]:
+                pending[executor.submit(_timed, stage.run, {i: results[i] for i in stage.inputs})] = stage.name
+            inline = runnable[-1]
+            finish(inline.name, *_timed(inline.run, {i: results[i] for i in inline.inputs}))
+        elif pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(pending.pop(future), *future.result())
+        elif not ready:
+            raise ValueError(f"Stage graph has a cycle among: {sorted(remaining)}")
+    return results, timings
@@ -0,0 +1,109 @@
+import json
+from collections.abc import Mapping
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # plain json fallback; same output, slower
+    orjson = None
+
+
+# ----------------------
+# ENCODING
+# ----------------------
+def _default(value):
+    # Config values reach results as read-only mappings and tuples (see freeze()).
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value) -> bytes:
+    """Compact UTF-8 JSON, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+# ----------------------
+# FIELD PROJECTION
+# ----------------------
+class Projection:
+    """
+    A parsed `fields=` parameter: comma-separated dotted paths.
+
+    Plain paths keep only those parts of the result, e.g.
+    "status,handoff.final_score". Paths prefixed with "-" drop parts, e.g.
+    "-handoff.persona_response.persona_options"; a single "-" name with no dot,
+    e.g. "-alternatives" or "-metadata", drops that key wherever it occurs.
+    Lists are transparent, so a path applies to every element.
+    """
+
+    def __init__(self, spec: str):
+        self.keep, self.drop, self.drop_anywhere = {}, {}, set()
+        for field in filter(None, (f.strip() for f in spec.split(","))):
+            if field.startswith("-"):
+                parts = field[1:].split(".")
+                if len(parts) == 1:
+                    self.drop_anywhere.add(parts[0])
+                else:
+                    self._add(self.drop, parts)
+            else:
+                self._add(self.keep, field.split("."))
+
+    @staticmethod
+    def _add(tree, parts):
+        for part in parts[:-1]:
+            node = tree.get(part, {})
+            if node is None:   # a shorter path already covers this one
+                return
+            tree = tree.setdefault(part, node)
+        tree[parts[-1]] = None
+
+    def apply(self, value):
+        """Projected copy of value; the original is not modified."""
+        if self.keep:
+            value = _keep(value, self.keep)
+        if (self.drop or self.drop_anywhere) and isinstance(value, (dict, list)):
+            value = _drop(value, self.drop, self.drop_anywhere)
+        return value
+
+
+def _keep(value, tree):
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_keep(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: _keep(value[key], sub) for key, sub in tree.items() if key in value}
+    return value
+
+
+def _drop(value, tree, anywhere):
+    """Copy of value without the dropped keys; untouched subtrees are shared, not copied."""
+    if isinstance(value, list):
+        items = [_drop(item, tree, anywhere) if isinstance(item, (dict, list)) else item for item in value]
+        return value if all(new is old for new, old in zip(items, value)) else items
+    tree = tree or {}
+    changed, kept = False, {}
+    for key, item in value.items():
+        if key in anywhere or (key in tree and tree[key] is None):
+            changed = True
+            continue
+        if isinstance(item, (dict, list)):
+            new = _drop(item, tree.get(key), anywhere)
+            changed = changed or new is not item
+            item = new
+        kept[key] = item
+    return kept if changed else value
+
+
+def project(value, fields: Optional[str]):
+    """Apply a `fields=` spec to a result; None or empty returns it unchanged."""
+    return Projection(fields).apply(value) if fields else value
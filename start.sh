@@ -1,2 +1,3 @@
 #!/bin/bash
-uvicorn api.main:app --host 0.0.0.0 --port $PORT
+# Pre-forked workers with a preloaded, warmed-up pipeline; see gunicorn.conf.py.
+exec gunicorn -c gunicorn.conf.py app.main:app
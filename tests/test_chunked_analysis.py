@@ -0,0 +1,89 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import engines.Rowan_Chunked_Analysis as chunked
+from benchmarks.corpus import generate_text
+from engines.Rowan_Analysis_Context import AnalysisContext
+from engines.Rowan_Chunked_Analysis import analyze_chunk, analyze_chunked, chunk_text
+from engines.Rowan_Config_Registry import current_snapshot
+from engines.Rowan_Logic_Engine import shared_analyzer
+from engines.Rowan_Tokenizer import segment_text
+from engines.ReadingLaw_Engine import merge_interpretations
+
+TEXT = generate_text(3000)
+
+
+def words(chunks):
+    return [word for chunk in chunks for sentence in segment_text(chunk) for word in sentence.split()]
+
+
+@pytest.mark.parametrize("max_tokens", [1, 7, 40, 400, 10 ** 6])
+def test_chunks_are_bounded_and_end_on_sentence_boundaries(max_tokens):
+    chunks = chunk_text(TEXT, max_tokens)
+
+    assert all(0 < len(chunk.split()) <= max_tokens for chunk in chunks)
+    assert words(chunks) == words([TEXT])
+    if max_tokens >= max(len(s.split()) for s in segment_text(TEXT)):
+        assert [s for chunk in chunks for s in segment_text(chunk)] == segment_text(TEXT)
+
+
+def test_a_sentence_longer_than_a_chunk_is_cut_into_windows():
+    long_sentence = " ".join(f"w{i}" for i in range(25))
+    chunks = chunk_text(f"Short one. {long_sentence}. Another short one. Last?", 10)
+
+    assert chunks == ["Short one",
+                      " ".join(f"w{i}" for i in range(10)),
+                      " ".join(f"w{i}" for i in range(10, 20)),
+                      " ".join(f"w{i}" for i in range(20, 25)),
+                      "Another short one. Last"]
+    assert chunk_text("   ", 10) == []
+
+
+@pytest.mark.parametrize("claims", [True, False])
+def test_merged_chunks_match_the_whole_text(claims):
+    snapshot = current_snapshot()
+    parts = [analyze_chunk(chunk, snapshot.version, claims, snapshot) for chunk in chunk_text(TEXT, 200)]
+
+    assert len(parts) > 1
+    analyzer = shared_analyzer()
+    assert analyzer.merge([part["logic"] for part in parts]) == analyzer.analyze(TEXT, claims=claims)
+
+
+def interpretation(reading, score):
+    return {"interpretation": reading, "score": score}
+
+
+def canon_result(ambiguity, confidence, ranked, status="stable", phases=()):
+    return {"ambiguity_score": ambiguity, "confidence_score": confidence, "phases_applied": list(phases),
+            "override_event": False, "top_interpretation": ranked[0] if ranked else None,
+            "alternatives": ranked[1:], "safety_audit": {"status": status, "chunk": ambiguity}}
+
+
+def test_merge_interpretations_keeps_best_readings_and_weakest_confidence():
+    merged = merge_interpretations([
+        canon_result(0.2, 0.9, [interpretation("narrow", 0.5), interpretation("broad", 0.3)]),
+        canon_result(0.4, 0.6, [interpretation("broad", 0.8)], status="unstable"),
+        canon_result(0.6, 0.7, [], status="unstable"),
+    ])
+
+    assert merged["ambiguity_score"] == 0.4
+    assert merged["confidence_score"] == 0.6
+    assert merged["top_interpretation"] == interpretation("broad", 0.8)
+    assert merged["alternatives"] == [interpretation("narrow", 0.5)]
+    assert merged["safety_audit"] == {"status": "unstable", "chunk": 0.4}
+
+
+def test_pool_and_inline_chunking_agree(monkeypatch):
+    inline = AnalysisContext(current_snapshot())
+    assert analyze_chunked(TEXT, inline, 200)["workers"] == 1
+
+    monkeypatch.setattr(chunked, "CHUNK_WORKERS", 2)
+    pooled = AnalysisContext(current_snapshot())
+    with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("spawn")) as pool:
+        summary = analyze_chunked(TEXT, pooled, 200, executor=pool)
+
+    assert summary["workers"] == 2 and summary["chunks"] > 2
+    assert pooled.logic(TEXT) == inline.logic(TEXT)
+    assert pooled.canon(TEXT, TEXT) == inline.canon(TEXT, TEXT)
@@ -0,0 +1,49 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import engines.ReadingLaw_Engine  # registers canon_index
+import engines.Rowan_Logic_Engine  # registers argument_analyzer
+from engines.Rowan_Config_Registry import CONFIG_DIR, HEURISTICS_FILE, ConfigRegistry, registry
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    for name in os.listdir(CONFIG_DIR):
+        if name.endswith(".json"):
+            shutil.copy(os.path.join(CONFIG_DIR, name), tmp_path)
+    return tmp_path
+
+
+def local_registry(config_dir):
+    local = ConfigRegistry(str(config_dir))
+    local.compilers = registry.compilers
+    return local
+
+
+def edit_heuristics(config_dir, edit):
+    path = config_dir / HEURISTICS_FILE
+    data = json.loads(path.read_text(encoding="utf-8"))
+    edit(data["Reasoning_Heuristics"])
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_failed_first_load_keeps_raising(config_dir):
+    edit_heuristics(config_dir, lambda h: h["Mind_Traps"]["traps"][0].update(weight="-0.1"))
+    local = local_registry(config_dir)
+    for _ in range(2):
+        with pytest.raises(ValueError, match="weight must be a number"):
+            local.current()
+
+
+def test_bad_reload_keeps_the_last_good_snapshot(config_dir):
+    local = local_registry(config_dir)
+    good = local.current()
+    edit_heuristics(config_dir, lambda h: h["Philosophical_Razors"]["razors"][0].update(keywords=[5]))
+
+    with pytest.raises(ValueError):
+        local.reload()
+    assert local.reload() is False   # the same broken files are not rebuilt on every poll
+    assert local.current() is good
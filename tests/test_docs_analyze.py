@@ -0,0 +1,82 @@
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.storage import S3ClientHolder, analysis_key
+from engines.Rowan_Config_Registry import current_snapshot
+
+BUCKET = "rowan-test"
+DOCUMENT = " ".join([
+    "The plaintiff argues that the statute must be construed narrowly because it imposes a criminal penalty.",
+    "Clearly the provision was intended to limit liability.",
+    "If the regulation applies, then the defendant must prevail.",
+] * 200)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        monkeypatch.setattr(main, "AWS_S3_BUCKET", BUCKET)
+        monkeypatch.setattr(main, "s3_clients", S3ClientHolder(region_name="us-east-1"))
+        client = main.s3_clients.get()
+        client.create_bucket(Bucket=BUCKET)
+        client.put_object(Bucket=BUCKET, Key="plaintiff/brief.txt", Body=DOCUMENT.encode("utf-8"))
+        yield client
+
+
+@pytest.fixture
+def api():
+    # Not used as a context manager, so the startup hook (watcher, warm-up) does not run.
+    return TestClient(main.app)
+
+
+def test_analysis_is_stored_next_to_the_object_and_reused(s3, api):
+    first = api.post("/docs/analyze", params={"key": "plaintiff/brief.txt"})
+    assert first.status_code == 200
+    body = first.json()
+    assert body["stored"] is False
+    analysis = body["analysis"]
+    assert analysis["config_version"] == current_snapshot().version
+    assert analysis["chunking"]["chunks"] > 1
+    assert analysis["logic"]["logic"]["claims_analysis"] is None
+    assert analysis["logic"]["logic"]["claim_count"] == 600
+
+    stored_key = analysis_key("plaintiff/brief.txt", current_snapshot().version)
+    s3.head_object(Bucket=BUCKET, Key=stored_key)
+
+    second = api.post("/docs/analyze", params={"key": "plaintiff/brief.txt"})
+    assert second.status_code == 200
+    assert second.json() == dict(body, stored=True)
+
+
+def test_per_claim_detail_is_opt_in_and_stored_apart(s3, api):
+    summary = api.post("/docs/analyze", params={"key": "plaintiff/brief.txt"}).json()["analysis"]
+    detailed = api.post("/docs/analyze", params={"key": "plaintiff/brief.txt", "claims": "true"}).json()
+
+    assert detailed["stored"] is False
+    assert len(detailed["analysis"]["logic"]["logic"]["claims_analysis"]) == 600
+    assert detailed["analysis"]["logic"]["logic"]["logic_score"] == summary["logic"]["logic"]["logic_score"]
+    s3.head_object(Bucket=BUCKET, Key=analysis_key("plaintiff/brief.txt", current_snapshot().version, claims=True))
+
+
+def test_changed_object_is_analysed_again(s3, api):
+    api.post("/docs/analyze", params={"key": "plaintiff/brief.txt"})
+    s3.put_object(Bucket=BUCKET, Key="plaintiff/brief.txt", Body=b"Clearly the contract is void.")
+
+    body = api.post("/docs/analyze", params={"key": "plaintiff/brief.txt"}).json()
+    assert body["stored"] is False
+    assert body["analysis"]["logic"]["logic"]["claim_count"] == 1
+
+
+def test_missing_and_empty_documents(s3, api):
+    assert api.post("/docs/analyze", params={"key": "defense/none.txt"}).status_code == 404
+    s3.put_object(Bucket=BUCKET, Key="defense/empty.txt", Body=b"   ")
+    assert api.post("/docs/analyze", params={"key": "defense/empty.txt"}).status_code == 422
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+import engines.Rowan_Intention_Engine as intention
+from benchmarks.corpus import generate_text
+from engines.Rowan_Intention_Engine import IN_FLIGHT, RESULT_CACHE, process_intention, without_timings
+
+TEXT = generate_text(200)   # long enough to be analysed in chunks
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    RESULT_CACHE.clear()
+    yield
+    RESULT_CACHE.clear()
+
+
+def test_cache_hits_do_not_report_the_filling_requests_timings():
+    first = process_intention(TEXT, session_id="first")
+    assert first["handoff"]["timings"]["persona"] > 0
+    assert first["chunking"]["ms"] > 0
+
+    hit = process_intention(TEXT, session_id="second")
+    assert hit["handoff"]["timings"] is None
+    assert hit["chunking"]["ms"] is None
+    assert hit == without_timings(first)
+
+
+def test_coalesced_waiters_do_not_report_the_leaders_timings(monkeypatch):
+    release = threading.Event()
+    evaluate_intention = intention.evaluate_intention
+
+    def held(*args, **kwargs):
+        release.wait(5)
+        return evaluate_intention(*args, **kwargs)
+
+    monkeypatch.setattr(intention, "evaluate_intention", held)
+    results = {}
+
+    def request(name):
+        results[name] = process_intention(TEXT, session_id=name)
+
+    threads = [threading.Thread(target=request, args=(name,)) for name in ("leader", "waiter")]
+    coalesced = IN_FLIGHT.coalesced
+    threads[0].start()
+    deadline = time.monotonic() + 5
+    while not IN_FLIGHT.in_flight():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+    threads[1].start()
+    while IN_FLIGHT.coalesced == coalesced:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results["leader"]["handoff"]["timings"]["persona"] > 0
+    assert results["waiter"] == without_timings(results["leader"])
@@ -0,0 +1,77 @@
+import random
+import re
+
+import pytest
+
+import engines.Rowan_Logic_Engine as logic
+from benchmarks.corpus import generate_text
+from engines.Rowan_Config_Registry import current_snapshot
+from engines.Rowan_Logic_Engine import KeywordHit, KeywordMatcher, RuleMatcher, _heuristic_entries, _rhetoric_entries
+from engines.Rowan_Tokenizer import tokenize
+
+KEYWORDS = ["a", "ab", "abc", "bc", "b c", "aa", "no", "not", "cannot", "it's", "c++", "+"]
+WORDS = ["a", "ab", "abc", "abcd", "bc", "b", "c", "aaa", "no", "not", "cannot", "nothing", "it's", "c++", "+", "x"]
+
+
+def reference_scan(entries, text):
+    """Every occurrence the old per-keyword scan would find: substring search, or \\b...\\b when bounded."""
+    hits = []
+    for keyword, label, bounded in entries:
+        if not keyword:
+            continue
+        pattern = rf"\b{re.escape(keyword)}\b" if bounded else re.escape(keyword)
+        hits += [KeywordHit(m.start(), m.start() + len(keyword), keyword, label)
+                 for m in re.finditer(f"(?={pattern})", text)]
+    return sorted(hits)
+
+
+def reference_labels(entries, text):
+    """The old presence checks: `keyword in text`, or re.search(\\b...\\b) when bounded."""
+    return {label for keyword, label, bounded in entries
+            if (re.search(rf"\b{re.escape(keyword)}\b", text) if bounded else keyword in text)}
+
+
+def entries(bounded):
+    return [(keyword, ("kw", i, keyword), bounded) for i, keyword in enumerate(KEYWORDS)]
+
+
+def random_texts(count=300, seed=7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(WORDS) + rng.choice([" ", "", ".", ", "]) for _ in range(rng.randint(0, 12)))
+
+
+@pytest.mark.parametrize("bounded", [False, True])
+def test_overlapping_and_prefix_keywords_match_the_per_keyword_scan(bounded):
+    matcher = KeywordMatcher(entries(bounded))
+    assert sorted(matcher.scan("aaa abc")) == reference_scan(entries(bounded), "aaa abc")
+    for text in random_texts():
+        assert sorted(matcher.scan(text)) == reference_scan(entries(bounded), text), text
+
+
+def test_bounded_keywords_need_word_boundaries_at_both_ends():
+    hits = KeywordMatcher(entries(True)).scan("cannot, nothing not. c++ a+b")
+    # As with \b, "c++" and a "+" between two other non-word characters never match.
+    assert {(hit.keyword, hit.start) for hit in hits} == {("cannot", 0), ("not", 16), ("a", 25), ("+", 26)}
+
+
+@pytest.mark.parametrize("direct_scan_max", [0, 10 ** 6])
+@pytest.mark.parametrize("bounded", [False, True])
+def test_labels_in_matches_the_old_presence_checks(monkeypatch, bounded, direct_scan_max):
+    monkeypatch.setattr(logic, "DIRECT_SCAN_MAX_KEYWORDS", direct_scan_max)
+    matcher = KeywordMatcher(entries(bounded))
+    for text in random_texts():
+        assert matcher.labels_in(text) == reference_labels(entries(bounded), text), text
+
+
+def test_configured_rules_match_the_per_keyword_scan():
+    config = current_snapshot().logic_config
+    matcher = RuleMatcher.from_config(config)
+    heuristics = list(_heuristic_entries(config["razors"], config["fallacies"]))
+    rhetoric = list(_rhetoric_entries(config["rhetoric_rules"]))
+
+    for seed in range(3):
+        text = tokenize(generate_text(1500, seed))
+        report = matcher.scan(text)
+        assert sorted(report.heuristics) == reference_scan(heuristics, text.normalized)
+        assert sorted(report.rhetoric) == reference_scan(rhetoric, text.lower)
@@ -0,0 +1,44 @@
+import pytest
+
+import engines.Rowan_Logic_Engine as logic
+from benchmarks.corpus import generate_text
+from engines.Rowan_Logic_Engine import LOGICAL_CHECKS, REAL_Engine, shared_analyzer
+
+CLAIMS = [
+    ("If the rule applies then the court must act", {"Subject-Verb Integrity", "Law of Non-Contradiction",
+                                                     "Conditional Inference", "Modal Detected"}),
+    ("The tenant paid and not late", set()),
+    ("Nobody signed it", {"Law of Non-Contradiction", "Quantifier Detected"}),
+]
+
+
+@pytest.mark.parametrize("claim, passed", CLAIMS)
+def test_claim_checks(claim, passed):
+    result = REAL_Engine({}, {}).evaluate_claim(claim)["logical_checks"]
+    assert result["passed_rules"] == [check for check in LOGICAL_CHECKS if check in passed]
+    assert result["failed_rules"] == [check for check in LOGICAL_CHECKS if check not in passed]
+
+
+def test_claims_and_totals_agree():
+    text = generate_text(3000)
+    analyzer = shared_analyzer()
+    detailed = analyzer.analyze(text)["logic"]
+    totals = analyzer.analyze(text, claims=False)["logic"]
+
+    assert totals["claim_count"] == len(detailed["claims_analysis"])
+    assert totals["passed_checks"] == REAL_Engine.check_totals(detailed)[1]
+    assert totals["logic_score"] == detailed["logic_score"]
+
+    # The claim-by-claim scan (used when lowercasing shifts offsets) reaches the same checks.
+    claims = [REAL_Engine({}, {}).evaluate_claim(c["core_statement"])["logical_checks"]
+              for c in detailed["claims_analysis"]]
+    assert claims == [c["logical_checks"] for c in detailed["claims_analysis"]]
+
+
+def test_vectorized_matrix_matches_pure_python(monkeypatch):
+    pytest.importorskip("numpy")
+    text = generate_text(3000)
+    monkeypatch.setattr(logic, "VECTORIZE_MIN_CLAIMS", 10 ** 9)
+    plain = shared_analyzer().analyze(text, claims=False)
+    monkeypatch.setattr(logic, "VECTORIZE_MIN_CLAIMS", 1)
+    assert shared_analyzer().analyze(text, claims=False) == plain
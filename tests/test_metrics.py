@@ -0,0 +1,52 @@
+import os
+
+from orchestrator.metrics import MetricsRegistry, merge_states, render_state
+from orchestrator.serialization import dumps
+
+
+def worker_registry(directory=None):
+    registry = MetricsRegistry(directory)
+    registry.counter("requests_total", "Requests.", ("handler",))
+    registry.gauge("in_flight", "Requests being served.")
+    registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    return registry
+
+
+def record(registry, requests, latencies):
+    metrics = registry._metrics
+    for _ in range(requests):
+        metrics["requests_total"].inc("orchestrate")
+    metrics["in_flight"].inc()
+    for value in latencies:
+        metrics["latency_seconds"].observe(value)
+
+
+def test_merge_sums_counters_gauges_and_histograms():
+    a, b = worker_registry(), worker_registry()
+    record(a, 2, [0.05, 0.5])
+    record(b, 3, [5.0])
+
+    text = render_state(merge_states([a.state(), b.state()]))
+    assert 'requests_total{handler="orchestrate"} 5' in text
+    assert "in_flight 2" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+
+
+def test_render_includes_other_workers_and_drops_gauges_of_exited_ones(tmp_path):
+    exited = worker_registry()
+    record(exited, 4, [0.5])
+    dead_pid = 2 ** 22 + 1   # above any pid_max, so never a live process
+    (tmp_path / f"{dead_pid}.json").write_bytes(dumps(exited.state()))
+
+    registry = worker_registry(str(tmp_path))
+    registry.share(interval=3600)
+    record(registry, 1, [0.05])
+
+    text = registry.render()
+    assert 'requests_total{handler="orchestrate"} 5' in text
+    assert "latency_seconds_count 2" in text
+    assert "in_flight 1" in text
+    assert (tmp_path / f"{os.getpid()}.json").exists()
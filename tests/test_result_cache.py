@@ -0,0 +1,94 @@
+import threading
+import time
+
+from engines.Rowan_Result_Cache import ResultCache, SingleFlight
+
+WAITERS = 8
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_coalesced(flight, fn, key="k"):
+    """One leader call blocked in `fn` until WAITERS more callers have joined it; returns each caller's outcome."""
+    release = threading.Event()
+    calls = []
+
+    def leader_fn():
+        calls.append(threading.current_thread().name)
+        release.wait(5)
+        return fn()
+
+    outcomes = {}
+
+    def call(name, leader):
+        try:
+            result = flight.run(key, leader_fn)
+            if leader:
+                result["mutated_by_leader"] = True
+            outcomes[name] = result
+        except Exception as e:
+            outcomes[name] = e
+
+    leader = threading.Thread(target=call, args=("leader", True), name="leader")
+    leader.start()
+    wait_until(lambda: calls)
+    waiters = [threading.Thread(target=call, args=(f"waiter{i}", False)) for i in range(WAITERS)]
+    for thread in waiters:
+        thread.start()
+    wait_until(lambda: flight.coalesced == WAITERS)
+    release.set()
+    for thread in [leader] + waiters:
+        thread.join(5)
+
+    assert calls == ["leader"]
+    assert flight.in_flight() == 0
+    return outcomes
+
+
+def test_waiters_share_the_leaders_result_as_private_copies():
+    flight = SingleFlight()
+    outcomes = run_coalesced(flight, lambda: {"score": 0.9, "claims": [{"id": 1}]})
+
+    assert outcomes.pop("leader") == {"score": 0.9, "claims": [{"id": 1}], "mutated_by_leader": True}
+    assert len(outcomes) == WAITERS
+    assert all(result == {"score": 0.9, "claims": [{"id": 1}]} for result in outcomes.values())
+    claim_lists = [result["claims"] for result in outcomes.values()]
+    assert len({id(claims) for claims in claim_lists}) == WAITERS
+
+
+def test_waiters_receive_the_leaders_exception():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("engine failed")
+
+    outcomes = run_coalesced(flight, fail)
+    assert len(outcomes) == WAITERS + 1
+    assert all(isinstance(e, ValueError) and str(e) == "engine failed" for e in outcomes.values())
+
+
+def test_a_finished_key_computes_again():
+    flight = SingleFlight()
+    assert flight.run("k", lambda: 1) == 1
+    assert flight.run("k", lambda: 2) == 2
+    assert flight.coalesced == 0 and flight.in_flight() == 0
+
+
+def test_result_cache_copies_and_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    value = {"claims": [1]}
+    cache.put("a", value)
+    value["claims"].append(2)
+    cache.get("a")["claims"].append(3)
+    assert cache.get("a") == {"claims": [1]}
+
+    cache.put("b", {})
+    cache.get("a")
+    cache.put("c", {})
+    assert cache.get("b") is None
+    assert cache.stats() == {"entries": 2, "max_entries": 2, "hits": 3, "misses": 1}
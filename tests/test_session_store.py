@@ -0,0 +1,119 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+import engines.Rowan_Session_Store as session_store
+from engines.Rowan_Session_Store import MAX_QUERY_CHARS, MemorySessionStore, SQLiteSessionStore, new_session
+
+PROCESSES, THREADS, INCREMENTS = 3, 2, 20
+
+
+class Clock:
+    """Stands in for the time module in the session store, for both clocks it reads."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store, "time", clock)
+    return clock
+
+
+def test_memory_store_evicts_least_recently_saved(clock):
+    store = MemorySessionStore(ttl=60, max_entries=2)
+    store.put("a", {"attempts": 1})
+    store.put("b", {"attempts": 2})
+    store.put("a", {"attempts": 3})   # saving again makes "a" the youngest
+    store.put("c", {"attempts": 4})
+
+    assert len(store) == 2
+    assert store.get("b") == new_session()
+    assert store.get("a") == {"attempts": 3}
+
+
+def test_memory_store_expires_idle_sessions(clock):
+    store = MemorySessionStore(ttl=60)
+    store.put("old", {"attempts": 1})
+    clock.now += 30
+    store.put("young", {"attempts": 2})
+    clock.now += 31
+
+    assert store.get("old") == new_session()
+    assert store.get("young") == {"attempts": 2}
+    store.put("other", {})
+    clock.now += 60.5
+    store.put("newest", {})
+    assert len(store) == 1   # expired sessions are dropped from the old end on every save
+
+
+def test_memory_store_is_bounded_by_bytes_and_caps_the_query():
+    store = MemorySessionStore(max_bytes=3 * MAX_QUERY_CHARS)
+    for i in range(10):
+        store.put(f"s{i}", {"last_query": "x" * (MAX_QUERY_CHARS + 100)})
+
+    assert len(store) == 2
+    assert store._bytes <= store.max_bytes
+    assert len(store.get("s9")["last_query"]) == MAX_QUERY_CHARS
+
+
+def test_sqlite_store_expires_sessions(tmp_path, clock):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl=60)
+    store.put("s", {"attempts": 2})
+    assert store.get("s") == {"attempts": 2}
+    clock.now += 61
+    assert store.get("s") == new_session()
+    store.delete("s")
+
+
+def increment(store, session_id):
+    for _ in range(INCREMENTS):
+        with store.session(session_id) as context:
+            attempts = context["attempts"]
+            time.sleep(0.001)   # widen the read-modify-write window
+            context["attempts"] = attempts + 1
+
+
+def increment_from_threads(path):
+    # A store of this process's own, as a forked server worker would have.
+    store = SQLiteSessionStore(path)
+    threads = [threading.Thread(target=increment, args=(store, "shared")) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_sqlite_session_locks_hold_across_processes_and_threads(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    SQLiteSessionStore(path)
+    processes = [multiprocessing.get_context("spawn").Process(target=increment_from_threads, args=(path,))
+                 for _ in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    assert SQLiteSessionStore(path).get("shared")["attempts"] == PROCESSES * THREADS * INCREMENTS
+
+
+def test_memory_session_locks_hold_across_threads():
+    store = MemorySessionStore()
+    threads = [threading.Thread(target=increment, args=(store, "shared")) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.get("shared")["attempts"] == 4 * INCREMENTS
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from app.storage import upload_stream
+
+BUCKET = "rowan-test"
+MIB = 1024 * 1024
+PART = 5 * MIB   # the smallest part S3 (and moto) accepts
+
+
+class RecordingS3:
+    """Passes calls through to a real (moto) client and records the multipart ones."""
+
+    def __init__(self, client):
+        self.client = client
+        self.parts = []
+        self.aborted = []
+
+    def upload_part(self, **kwargs):
+        self.parts.append((kwargs["PartNumber"], len(kwargs["Body"])))
+        return self.client.upload_part(**kwargs)
+
+    def abort_multipart_upload(self, **kwargs):
+        self.aborted.append(kwargs["UploadId"])
+        return self.client.abort_multipart_upload(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield RecordingS3(client)
+
+
+async def chunks(data, size, fail_after=None):
+    for offset in range(0, len(data), size):
+        if fail_after is not None and offset >= fail_after:
+            raise IOError("client went away")
+        yield data[offset:offset + size]
+
+
+def body(size):
+    return bytes(i % 251 for i in range(size))
+
+
+def test_multipart_upload_cuts_parts_at_part_size(s3):
+    data = body(2 * PART + 3 * MIB + 17)
+    stats = asyncio.run(upload_stream(s3, BUCKET, "doc.txt", chunks(data, 700 * 1024),
+                                      part_size=PART, max_inflight=2))
+
+    assert sorted(s3.parts) == [(1, PART), (2, PART), (3, 3 * MIB + 17)]
+    assert stats["bytes"] == len(data) and stats["parts"] == 3
+    assert s3.get_object(Bucket=BUCKET, Key="doc.txt")["Body"].read() == data
+    assert not s3.aborted
+
+
+def test_small_body_is_a_single_put(s3):
+    data = body(MIB)
+    stats = asyncio.run(upload_stream(s3, BUCKET, "small.txt", chunks(data, 64 * 1024), part_size=PART))
+
+    assert s3.parts == []
+    assert stats["parts"] == 1
+    assert s3.get_object(Bucket=BUCKET, Key="small.txt")["Body"].read() == data
+
+
+def test_failing_source_aborts_the_upload(s3):
+    data = body(3 * PART)
+    with pytest.raises(IOError, match="client went away"):
+        asyncio.run(upload_stream(s3, BUCKET, "broken.txt", chunks(data, MIB, fail_after=PART + 2 * MIB),
+                                  part_size=PART))
+
+    # Part 1 was queued before the failure; it may have been cancelled before it started.
+    assert s3.parts in ([], [(1, PART)])
+    assert len(s3.aborted) == 1
+    assert "Uploads" not in s3.list_multipart_uploads(Bucket=BUCKET)
+    with pytest.raises(s3.exceptions.NoSuchKey):
+        s3.get_object(Bucket=BUCKET, Key="broken.txt")